@@ -0,0 +1,152 @@
+"""
+Headless batch analysis: runs the ETF analysis for many tickers and date
+windows on a process pool and writes the results to Parquet (or CSV).
+
+Examples:
+    python batch_analysis.py 069500 229200 --window 20240101:20241231
+    python batch_analysis.py --universe --window 20240101:20241231 --window 20230101:20231231 -o out
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+
+METRIC_COLUMNS = ['sharpe', 'treynor', 'beta', 'volatility', 'excess_return']
+
+# Per-process state, created once by the pool initializer
+_fetcher = None
+
+def _init_worker(rate):
+    global _fetcher
+    # Every process has its own rate limiter, so split the overall request rate
+    os.environ["ETF_FETCH_RATE"] = str(rate)
+    from data.etf_data import ETFDataFetcher
+    _fetcher = ETFDataFetcher()
+
+def _number(value):
+    # Metrics that could not be computed are 'N/A' in the GUI
+    return value if isinstance(value, (int, float)) else float("nan")
+
+def analyze_task(task):
+    """
+    Runs one (ticker, start, end) analysis in a pool process.
+    Returns (summary row dict, attribution DataFrame).
+    """
+    from data.analysis import analyze_etf, AnalysisError
+    ticker, start_date, end_date = task
+    row = {'ticker': ticker, 'start': start_date, 'end': end_date}
+    try:
+        _, name, total_return, df, pdf, metrics = analyze_etf(ticker, start_date, end_date, _fetcher)
+    except AnalysisError as e:
+        row['error'] = str(e)
+        return row, pd.DataFrame()
+    except Exception as e:
+        row['error'] = f"{type(e).__name__}: {e}"
+        return row, pd.DataFrame()
+
+    row.update({
+        'name': name,
+        'first_day': df.index[0].strftime("%Y%m%d"),
+        'last_day': df.index[-1].strftime("%Y%m%d"),
+        'total_return': total_return,
+        'seconds': next((s['seconds'] for s in metrics.get('stages', []) if s['depth'] == 0), None),
+    })
+    for col in METRIC_COLUMNS:
+        row[col] = _number(metrics.get(col))
+
+    attribution = pdf.reset_index()
+    attribution.columns = [str(col) for col in attribution.columns]
+    attribution.insert(0, 'etf', ticker)
+    attribution.insert(1, 'start', start_date)
+    attribution.insert(2, 'end', end_date)
+    return row, attribution
+
+def parse_window(text):
+    start, sep, end = text.partition(":")
+    if not sep or len(start) != 8 or len(end) != 8 or not (start + end).isdigit():
+        raise argparse.ArgumentTypeError(f"window must be YYYYMMDD:YYYYMMDD, got {text!r}")
+    return start, end
+
+def resolve_tickers(args):
+    tickers = list(args.tickers)
+    if args.universe:
+        from data.etf_data import ETFDataFetcher
+        universe = ETFDataFetcher().get_etf_universe()
+        tickers += universe.index[universe['category'] == "Domestic"].tolist()
+    return list(dict.fromkeys(tickers))
+
+def prewarm(windows):
+    """
+    Loads the data every analysis shares (calendar, market snapshots, name index)
+    once in the parent, so pool processes find it in the local cache.
+    """
+    from data.etf_data import ETFDataFetcher
+    fetcher = ETFDataFetcher()
+    for start_date, end_date in windows:
+        start, end = fetcher.calendar.snap_range(start_date, end_date)
+        if start is None:
+            continue
+        fetcher.get_market_snapshot(start)
+        fetcher.get_market_snapshot(end)
+        fetcher.name_index.get(end)
+
+def write_table(df, path_stem, fmt):
+    if fmt == "parquet":
+        try:
+            df.to_parquet(path_stem + ".parquet", index=False)
+            return path_stem + ".parquet"
+        except ImportError:
+            print("Parquet engine (pyarrow) not installed, writing CSV instead.")
+    df.to_csv(path_stem + ".csv", index=False, encoding="utf-8-sig")
+    return path_stem + ".csv"
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch ETF analysis")
+    parser.add_argument("tickers", nargs="*", help="ETF tickers (e.g. 069500)")
+    parser.add_argument("--universe", action="store_true", help="add every domestic equity ETF")
+    parser.add_argument("--window", action="append", type=parse_window, required=True,
+                        help="analysis window YYYYMMDD:YYYYMMDD (repeatable)")
+    parser.add_argument("-o", "--output-dir", default="batch_output", help="output directory")
+    parser.add_argument("--format", choices=["parquet", "csv"], default="parquet")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4, help="analysis processes")
+    args = parser.parse_args()
+
+    tickers = resolve_tickers(args)
+    if not tickers:
+        parser.error("no tickers given (pass tickers or --universe)")
+
+    tasks = [(ticker, start, end) for start, end in args.window for ticker in tickers]
+    print(f"Analyzing {len(tickers)} ETFs x {len(args.window)} windows with {args.workers} processes...")
+
+    started = time.time()
+    prewarm(args.window)
+
+    total_rate = float(os.environ.get("ETF_FETCH_RATE", 20))
+    rows, attributions = [], []
+    # spawn: the parent already runs fetch threads, which must not be forked
+    with ProcessPoolExecutor(args.workers, mp_context=multiprocessing.get_context("spawn"),
+                             initializer=_init_worker, initargs=(total_rate / args.workers,)) as pool:
+        for i, (row, attribution) in enumerate(pool.map(analyze_task, tasks, chunksize=4), 1):
+            rows.append(row)
+            if not attribution.empty:
+                attributions.append(attribution)
+            if i % 50 == 0 or i == len(tasks):
+                print(f"  {i}/{len(tasks)} done ({time.time() - started:.1f}s)")
+
+    summary = pd.DataFrame(rows)
+    attribution = pd.concat(attributions, ignore_index=True) if attributions else pd.DataFrame()
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    print("Summary:", write_table(summary, os.path.join(args.output_dir, "summary"), args.format))
+    if not attribution.empty:
+        print("Attribution:", write_table(attribution, os.path.join(args.output_dir, "attribution"), args.format))
+
+    failed = summary['error'].notna().sum() if 'error' in summary.columns else 0
+    print(f"Done in {time.time() - started:.1f}s, {failed} of {len(tasks)} failed.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,233 @@
+"""
+End-to-end benchmarks for the analysis pipeline, run on replayed fixtures.
+
+Every case runs in its own process with an empty local cache, so results do
+not depend on earlier runs. For each case we report wall time (median of
+--repeat runs), number of data requests and peak Python memory (tracemalloc,
+measured in a separate run so it does not slow down the timed ones).
+
+Usage:
+    python benchmarks/run_benchmarks.py --record            # capture fixtures (needs network)
+    python benchmarks/run_benchmarks.py                     # replay + compare with baselines.json
+    python benchmarks/run_benchmarks.py --update-baseline   # replay + store results as baseline
+    python benchmarks/run_benchmarks.py --case analysis_worker --case etf_list
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+FIXTURE_DIR = os.path.join(BENCH_DIR, "fixtures")
+BASELINE_FILE = os.path.join(BENCH_DIR, "baselines.json")
+
+# Inputs used by every case (dates are relative to the fixture recording date)
+KR_TICKER = "069500"
+FOREIGN_TICKER = "SPY"
+PERIOD_DAYS = 365
+TABLE_ROWS = [50, 500, 5000]
+
+# Allowed slowdown / memory growth before a case counts as a regression
+TOLERANCE = 0.25
+
+def _period():
+    from datetime import timedelta
+    from data import sources
+    end = sources.today()
+    return end - timedelta(days=PERIOD_DAYS), end
+
+def _run_worker(worker):
+    errors = []
+    worker.error.connect(errors.append)
+    worker.run()
+    if errors:
+        raise RuntimeError(errors[0])
+
+def bench_analysis_worker():
+    from ui.main_window import AnalysisWorker
+    start, end = _period()
+    _run_worker(AnalysisWorker(KR_TICKER, start.strftime("%Y%m%d"), end.strftime("%Y%m%d")))
+
+def bench_foreign_worker():
+    from ui.foreign_analysis_window import ForeignAnalysisWorker
+    start, end = _period()
+    _run_worker(ForeignAnalysisWorker(FOREIGN_TICKER, start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d")))
+
+def bench_market_indices():
+    from data.market_data import MarketDataFetcher
+    MarketDataFetcher().get_market_indices()
+
+def bench_etf_list():
+    from data.etf_data import ETFDataFetcher
+    ETFDataFetcher().get_all_etf_list()
+
+def bench_listing_date():
+    from data.etf_data import ETFDataFetcher
+    ETFDataFetcher().get_listing_date(KR_TICKER)
+
+def _table_frame(rows):
+    import numpy as np
+    import pandas as pd
+    rng = np.random.default_rng(0)
+    weights = rng.dirichlet(np.ones(rows)) * 100
+    returns = rng.normal(0, 10, rows)
+    return pd.DataFrame({
+        'Name': [f"종목{i:05d}" for i in range(rows)],
+        '비중': weights,
+        '금액': rng.integers(1_000, 10_000_000, rows).astype(float),
+        'Return': returns,
+        'Contribution': returns * weights / 100,
+    }, index=pd.Index([f"{i:06d}" for i in range(rows)], name="티커"))
+
+def _bench_populate_table(rows):
+    def bench():
+        from ui.result_view import ResultViewWidget
+        widget = ResultViewWidget(lambda: None)
+        widget.update_constituents(_table_frame(rows))
+        # Every column through the three sort states (desc, asc, default)
+        for column in range(widget.constituent_model.columnCount()):
+            for _ in range(3):
+                widget.on_header_clicked(column)
+        # Rendering only formats the visible rows
+        widget.resize(1000, 700)
+        widget.constituent_table.grab()
+    return bench
+
+CASES = {
+    "analysis_worker": bench_analysis_worker,
+    "foreign_worker": bench_foreign_worker,
+    "market_indices": bench_market_indices,
+    "etf_list": bench_etf_list,
+    "listing_date": bench_listing_date,
+}
+for _rows in TABLE_ROWS:
+    CASES[f"populate_table_{_rows}"] = _bench_populate_table(_rows)
+
+def run_case(name, measure_memory):
+    """
+    Runs one case in the current process (child side).
+    """
+    if name.startswith("populate_table"):
+        from PyQt6.QtWidgets import QApplication
+        app = QApplication.instance() or QApplication([])
+
+    from data import sources
+    requests_before = sources.request_count()
+    if measure_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    CASES[name]()
+    elapsed = time.perf_counter() - start
+    result = {"wall_time_s": elapsed, "requests": sources.request_count() - requests_before}
+    if measure_memory:
+        result["peak_mem_mb"] = tracemalloc.get_traced_memory()[1] / 2**20
+        tracemalloc.stop()
+    return result
+
+def spawn_case(name, mode, measure_memory):
+    """
+    Runs one case in a fresh process with an empty cache directory (parent side).
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        result_file = os.path.join(tmp, "result.json")
+        env = dict(os.environ)
+        env.update({
+            "ETF_DATA_SOURCE_MODE": mode,
+            "ETF_FIXTURE_DIR": FIXTURE_DIR,
+            "ETF_ANALYSIS_CACHE_DIR": os.path.join(tmp, "cache"),
+            "QT_QPA_PLATFORM": env.get("QT_QPA_PLATFORM", "offscreen"),
+        })
+        cmd = [sys.executable, os.path.abspath(__file__), "--child", name, "--result-file", result_file]
+        if measure_memory:
+            cmd.append("--memory")
+        proc = subprocess.run(cmd, env=env, cwd=ROOT_DIR, capture_output=True, text=True)
+        if proc.returncode != 0 or not os.path.exists(result_file):
+            raise RuntimeError(f"{name} failed:\n{proc.stdout}\n{proc.stderr}")
+        with open(result_file, encoding="utf-8") as f:
+            return json.load(f)
+
+def measure(name, repeat):
+    runs = [spawn_case(name, "replay", False) for _ in range(repeat)]
+    memory = spawn_case(name, "replay", True)
+    return {
+        "wall_time_s": round(statistics.median(r["wall_time_s"] for r in runs), 4),
+        "requests": runs[0]["requests"],
+        "peak_mem_mb": round(memory["peak_mem_mb"], 2),
+    }
+
+def compare(name, result, baseline):
+    """
+    Returns a list of regression messages for one case.
+    """
+    if not baseline:
+        return []
+    problems = []
+    if result["wall_time_s"] > baseline["wall_time_s"] * (1 + TOLERANCE):
+        problems.append(f"wall time {result['wall_time_s']:.3f}s > {baseline['wall_time_s']:.3f}s")
+    if result["requests"] > baseline["requests"]:
+        problems.append(f"requests {result['requests']} > {baseline['requests']}")
+    if result["peak_mem_mb"] > baseline["peak_mem_mb"] * (1 + TOLERANCE):
+        problems.append(f"peak memory {result['peak_mem_mb']:.1f}MB > {baseline['peak_mem_mb']:.1f}MB")
+    return [f"{name}: {p}" for p in problems]
+
+def main():
+    parser = argparse.ArgumentParser(description="ETF analysis benchmarks")
+    parser.add_argument("--case", action="append", choices=list(CASES), help="run only these cases")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case")
+    parser.add_argument("--record", action="store_true", help="record fixtures from the live sources")
+    parser.add_argument("--update-baseline", action="store_true", help="store results in baselines.json")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--result-file", help=argparse.SUPPRESS)
+    parser.add_argument("--memory", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        sys.path.insert(0, ROOT_DIR)
+        result = run_case(args.child, args.memory)
+        with open(args.result_file, "w", encoding="utf-8") as f:
+            json.dump(result, f)
+        return 0
+
+    names = args.case or list(CASES)
+    if args.record:
+        for name in names:
+            print(f"recording {name} ...")
+            spawn_case(name, "record", False)
+        return 0
+
+    if not os.path.exists(os.path.join(FIXTURE_DIR, "manifest.json")):
+        print(f"No fixtures in {FIXTURE_DIR}, run with --record first.")
+        return 1
+
+    baselines = {}
+    if os.path.exists(BASELINE_FILE):
+        with open(BASELINE_FILE, encoding="utf-8") as f:
+            baselines = json.load(f)
+
+    results, regressions = {}, []
+    print(f"{'case':<24}{'wall (s)':>10}{'requests':>10}{'peak (MB)':>11}")
+    for name in names:
+        result = measure(name, args.repeat)
+        results[name] = result
+        print(f"{name:<24}{result['wall_time_s']:>10.3f}{result['requests']:>10}{result['peak_mem_mb']:>11.1f}")
+        regressions += compare(name, result, baselines.get(name))
+
+    if args.update_baseline:
+        baselines.update(results)
+        with open(BASELINE_FILE, "w", encoding="utf-8") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+        print(f"Baselines written to {BASELINE_FILE}")
+        return 0
+
+    for message in regressions:
+        print(f"REGRESSION {message}")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
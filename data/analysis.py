@@ -0,0 +1,200 @@
+"""
+Qt-free ETF analysis pipeline shared by the GUI worker and the batch CLI.
+"""
+import pandas as pd
+from data.etf_data import ETFDataFetcher, close_returns, corporate_action_tickers
+from data.analysis_state import AnalysisState
+from data.attribution import weight_matrix, daily_return_matrix, linked_attribution
+from data.fetch_executor import get_executor
+from data.metrics import (daily_returns, rolling_metrics,
+                          ROLLING_WINDOWS, ROLLING_COLUMNS)
+from data.tracing import trace, span
+
+class AnalysisError(Exception):
+    """
+    Analysis could not run for the given input (message is shown to the user).
+    """
+
+def analyze_etf(ticker, start_date, end_date, etf_fetcher=None, state=None, daily_attribution=False):
+    """
+    Runs the full analysis of one ETF over [start_date, end_date] (YYYYMMDD).
+    Returns (ticker, name, total_return, price_df, pdf_df, metrics);
+    metrics['stages'] holds the per-stage trace summary.
+
+    state is an AnalysisState kept by the caller between runs: when only the
+    window changed, the loaded data is reused and only the new days are fetched.
+    daily_attribution uses every trading day's PDF and constituent returns
+    (linked over the period) instead of the start-date basket.
+    Raises AnalysisError if there is nothing to analyze.
+    """
+    with trace("analysis") as tr:
+        etf_fetcher = etf_fetcher or ETFDataFetcher()
+        executor = get_executor()
+        state = state if state is not None else AnalysisState()
+        state.use_ticker(ticker)
+
+        # Use Ticker as Name
+        name = ticker
+
+        # Snap the window to KRX trading days so no request is spent on a holiday
+        with span("calendar"):
+            start_date, end_date = etf_fetcher.calendar.snap_range(start_date, end_date)
+        if start_date is None:
+            raise AnalysisError("No trading day in the selected period.")
+
+        # Price history, benchmark and start-date PDF are independent,
+        # so submit them together and let the executor fetch them concurrently.
+        # Days / PDFs already in the state are not fetched again.
+        price_future = executor.submit(
+            state.prices.get, start_date, end_date,
+            lambda s, e: etf_fetcher.get_etf_price_history(ticker, s, e)
+        )
+        bm_future = executor.submit(state.benchmark.get, start_date, end_date, etf_fetcher.get_benchmark_data)
+        pdf_future = executor.submit(state.get_pdf, start_date, lambda d: etf_fetcher.get_etf_pdf(ticker, d))
+
+        # 1. Fetch Price History
+        df = price_future.result()
+
+        if df.empty:
+            raise AnalysisError("No data found for this ticker/period.")
+
+        # Calculate Returns
+        start_price = df['NAV'].iloc[0] if 'NAV' in df.columns else df['종가'].iloc[0]
+        end_price = df['NAV'].iloc[-1] if 'NAV' in df.columns else df['종가'].iloc[-1]
+        total_return = (end_price - start_price) / start_price * 100
+
+        # 2. Fetch Benchmark (KOSPI)
+        bm_df = bm_future.result()
+
+        with span("metrics"):
+            metrics = {
+                'sharpe': 'N/A',
+                'treynor': 'N/A',
+                'excess_return': 'N/A',
+                'alpha': 'N/A'
+            }
+
+            if not bm_df.empty:
+                # Daily returns from '종가', benchmark aligned on the ETF's dates
+                etf_daily_ret = daily_returns(df['종가'])
+                bm_daily_ret = daily_returns(bm_df['종가'])
+                bm_total_return = (bm_df['종가'].iloc[-1] - bm_df['종가'].iloc[0]) / bm_df['종가'].iloc[0] * 100
+
+                # Aligned daily returns, kept for rolling / incremental views
+                metrics['returns'] = pd.DataFrame({
+                    'etf': etf_daily_ret,
+                    'benchmark': bm_daily_ret.reindex(etf_daily_ret.index),
+                })
+
+                # Sharpe (risk-free rate = 0), beta and Treynor from running sums:
+                # only the dates that entered / left the window are processed
+                row = state.update_returns(metrics['returns'])
+                if row['count'] > 0:
+                    row['excess_return'] = total_return - bm_total_return
+                for key in ['excess_return', 'sharpe', 'treynor', 'beta', 'volatility']:
+                    if key in row and pd.notna(row[key]):
+                        metrics[key] = float(row[key])
+
+        with span("rolling"):
+            # Rolling Sharpe / volatility / beta / correlation per window (O(n) each)
+            if 'returns' in metrics:
+                returns = metrics['returns']
+                metrics['rolling'] = {}
+                for window in ROLLING_WINDOWS:
+                    rolling = rolling_metrics(returns[['etf']], returns['benchmark'], window)
+                    metrics['rolling'][window] = pd.DataFrame({col: rolling[col]['etf'] for col in ROLLING_COLUMNS})
+
+        # 3. Attribution Analysis (Top 10 Holdings at Start)
+        # We use start_date PDF to see what contributed to the performance
+        pdf = pdf_future.result()
+
+        # start_date is already a trading day; if the PDF is still empty the ETF was
+        # listed later, so use its first trading day in the window (not the end date)
+        first_day = df.index[0].strftime("%Y%m%d")
+        if pdf.empty and first_day != start_date:
+            pdf = state.get_pdf(first_day, lambda d: etf_fetcher.get_etf_pdf(ticker, d))
+
+        # Add 'Return' and 'Contribution' columns to PDF
+        pdf['Return'] = 0.0
+        pdf['Contribution'] = 0.0
+
+        if not pdf.empty:
+            # Find weight column
+            weight_col = None
+            for col in ['비중', 'Weight', 'weight']:
+                if col in pdf.columns:
+                    weight_col = col
+                    break
+
+            if weight_col and daily_attribution:
+                pdf = _daily_attribution(ticker, pdf, weight_col, df.index, etf_fetcher, state, executor)
+                metrics['attribution'] = 'daily'
+                last_day = df.index[-1].strftime("%Y%m%d")
+                pdf['Name'] = state.get_names(list(pdf.index), lambda t: etf_fetcher.get_stock_names(t, last_day))
+
+            elif weight_col:
+                # Returns for every constituent from two market-wide snapshots
+                # (first and last trading day of the ETF price history)
+                last_day = df.index[-1].strftime("%Y%m%d")
+                with span("constituent_returns") as s:
+                    s.rows = len(pdf)
+                    start_close, end_close = executor.map(
+                        lambda d: state.get_closes(d, etf_fetcher.get_market_snapshot), [first_day, last_day]
+                    )
+                    start_shares, end_shares = executor.map(
+                        lambda d: state.get_shares(d, etf_fetcher.get_listed_shares), [first_day, last_day]
+                    )
+                    returns = close_returns(start_close, end_close, pdf.index)
+                    # Unadjusted closes are wrong across a split / bonus issue, and a stock
+                    # listed inside the window has no start close: use adjusted history
+                    recheck = corporate_action_tickers(start_close, end_close, start_shares, end_shares, pdf.index)
+                    if recheck:
+                        adjusted = etf_fetcher.get_adjusted_returns(recheck, first_day, last_day)
+                        mask = returns.index.isin(recheck)
+                        returns[mask] = adjusted.reindex(returns.index[mask]).values
+
+                # Stocks without a price stay NaN (shown as N/A)
+                pdf['Return'] = returns.values
+                pdf['Contribution'] = pdf['Return'] * (pdf[weight_col] / 100)
+
+                # Names for All Constituents (one lookup in the daily name index)
+                pdf['Name'] = state.get_names(list(pdf.index), lambda t: etf_fetcher.get_stock_names(t, last_day))
+
+    # Per-stage timings / request counts for the result view
+    metrics['stages'] = tr.summary()
+    return ticker, name, total_return, df, pdf, metrics
+
+def _daily_attribution(ticker, pdf, weight_col, index, etf_fetcher, state, executor):
+    """
+    Replaces Return / Contribution of the start-date PDF with the daily
+    attribution over the ETF's trading days. Constituents bought later in the
+    period are appended with the first PDF row they appear in.
+    """
+    days = [d.strftime("%Y%m%d") for d in index]
+    # Kept in the local PDF store and in the state, so reruns do not download again
+    pdfs = state.get_pdfs(days, lambda missing: etf_fetcher.get_pdf_history(ticker, missing))
+
+    with span("daily_closes") as s:
+        snapshots = executor.map(lambda d: state.get_snapshot(d, etf_fetcher.get_market_snapshot), days)
+        s.rows = len(snapshots)
+
+    with span("attribution") as s:
+        weights = weight_matrix(pdfs, weight_col, index)
+        def by_day(series):
+            return pd.DataFrame(
+                {day: x.astype(float).reindex(weights.columns) for day, x in zip(index, series)}
+            ).T.reindex(index=index, columns=weights.columns)
+        returns = daily_return_matrix(
+            by_day(x['종가'] for x in snapshots), by_day(x['등락률'] for x in snapshots)
+        )
+        result = linked_attribution(weights, returns)
+        s.rows = len(result)
+
+    held = [p for p in [pdf] + [pdfs[d] for d in days] if not p.empty]
+    rows = pd.concat(held)
+    rows = rows[~rows.index.duplicated(keep='first')]
+    # Never-priced constituents stay NaN (shown as N/A)
+    returns = result['Return'].reindex(rows.index)
+    rows['Return'] = returns.values
+    rows['Contribution'] = result['Contribution'].reindex(rows.index).where(returns.notna()).values
+    return rows
@@ -0,0 +1,172 @@
+"""
+Reusable intermediate results of the single-ETF analysis.
+
+When an analysis is run again with only the window changed (e.g. the end
+date moved forward by a week), the histories already loaded in memory are
+reused and only the missing days are fetched. The return statistics are
+updated by adding / removing the dates that entered or left the window.
+"""
+from datetime import timedelta
+import numpy as np
+import pandas as pd
+from data import sources
+from data.price_cache import missing_ranges, DATE_FMT
+from data.metrics import RunningMoments
+
+def _yesterday():
+    return (sources.today() - timedelta(days=1)).strftime(DATE_FMT)
+
+class LoadedHistory:
+    """
+    Daily OHLCV of one ticker kept in memory, with the date ranges already loaded.
+    Today's bar is never marked as loaded since it may still change.
+    """
+    def __init__(self):
+        self.df = pd.DataFrame()
+        self.covered = []
+
+    def get(self, start_date, end_date, fetch_func):
+        """
+        Returns the rows of [start_date, end_date], calling
+        fetch_func(gap_start, gap_end) only for ranges not loaded yet.
+        """
+        for gap_start, gap_end in missing_ranges(start_date, end_date, self.covered):
+            part = fetch_func(gap_start, gap_end)
+            if part.empty:
+                # Failed requests come back empty too, so do not remember the gap
+                continue
+            if not self.df.empty:
+                keep = (self.df.index < pd.Timestamp(gap_start)) | (self.df.index > pd.Timestamp(gap_end))
+                part = pd.concat([self.df[keep], part]).sort_index()
+            self.df = part
+
+            covered_end = min(gap_end, _yesterday())
+            if gap_start <= covered_end:
+                self.covered.append((gap_start, covered_end))
+
+        if self.df.empty:
+            return pd.DataFrame()
+        return self.df.loc[pd.Timestamp(start_date):pd.Timestamp(end_date)].copy()
+
+class AnalysisState:
+    """
+    State kept between analyses (one per main window).
+
+    ETF-specific parts (price history, window returns with their running
+    moments, PDFs) are dropped when the ticker changes; the benchmark history,
+    constituent snapshots, share counts and names are market-wide and kept.
+    """
+    def __init__(self):
+        self.ticker = None
+        self.benchmark = LoadedHistory()
+        # date -> '종가' / '등락률' of every stock (from the market snapshot)
+        self.snapshots = {}
+        # date -> '상장주식수' of every stock
+        self.shares = {}
+        # stock ticker -> name
+        self.names = {}
+        self._reset_etf()
+
+    def _reset_etf(self):
+        self.prices = LoadedHistory()
+        self.pdfs = {}
+        self.returns = pd.DataFrame(columns=['etf', 'benchmark'], dtype=float)
+        self.moments = RunningMoments()
+
+    def use_ticker(self, ticker):
+        if ticker != self.ticker:
+            self.ticker = ticker
+            self._reset_etf()
+
+    def update_returns(self, returns):
+        """
+        Moves the running moments to the given window returns (DataFrame with
+        'etf' and 'benchmark' columns). Only dates that entered or left the
+        window, or whose values changed (today's bar), are added / removed.
+        Returns the moments' metrics dict.
+        """
+        old = self.returns
+        common = old.index.intersection(returns.index)
+        before = old.loc[common, ['etf', 'benchmark']].to_numpy(dtype=float)
+        after = returns.loc[common, ['etf', 'benchmark']].to_numpy(dtype=float)
+        same = ((before == after) | (np.isnan(before) & np.isnan(after))).all(axis=1)
+        changed = common[~same]
+
+        removed = old.index.difference(returns.index).union(changed)
+        added = returns.index.difference(old.index).union(changed)
+
+        if len(removed) + len(added) >= len(returns):
+            # Mostly a new window, a rebuild is cheaper and exact
+            self.moments.clear()
+            self.moments.add(returns['etf'], returns['benchmark'])
+        else:
+            self.moments.remove(old.loc[removed, 'etf'], old.loc[removed, 'benchmark'])
+            self.moments.add(returns.loc[added, 'etf'], returns.loc[added, 'benchmark'])
+
+        self.returns = returns
+        return self.moments.metrics()
+
+    def get_pdf(self, date, fetch_func):
+        """
+        PDF of the ETF on date; fetch_func(date) is called once per date.
+        """
+        if date not in self.pdfs:
+            pdf = fetch_func(date)
+            if pdf.empty:
+                return pdf
+            self.pdfs[date] = pdf
+        return self.pdfs[date].copy()
+
+    def get_pdfs(self, dates, fetch_many):
+        """
+        {date: PDF} for every date; fetch_many(missing_dates) returns {date: PDF}
+        for the dates not loaded yet.
+        """
+        missing = [d for d in dates if d not in self.pdfs]
+        if missing:
+            self.pdfs.update({d: pdf for d, pdf in fetch_many(missing).items() if not pdf.empty})
+        return {d: self.pdfs[d].copy() if d in self.pdfs else pd.DataFrame() for d in dates}
+
+    def get_snapshot(self, date, fetch_func):
+        """
+        '종가' and '등락률' (%) of every stock on date; fetch_func(date) returns
+        the market snapshot. KRX computes '등락률' against the adjusted base
+        price, so it does not show a split / bonus-issue day as a price drop.
+        Today's snapshot is refetched every time.
+        """
+        if date in self.snapshots:
+            return self.snapshots[date]
+        snapshot = fetch_func(date)
+        if snapshot.empty:
+            return pd.DataFrame(columns=['종가', '등락률'], dtype=float)
+        snapshot = snapshot[['종가', '등락률']]
+        if date <= _yesterday():
+            self.snapshots[date] = snapshot
+        return snapshot
+
+    def get_closes(self, date, fetch_func):
+        """
+        '종가' of every stock on date (see get_snapshot).
+        """
+        return self.get_snapshot(date, fetch_func)['종가']
+
+    def get_shares(self, date, fetch_func):
+        """
+        Listed share count of every stock on date; fetch_func(date) returns it
+        as a by-ticker Series. Today's counts are refetched every time.
+        """
+        if date in self.shares:
+            return self.shares[date]
+        shares = fetch_func(date)
+        if not shares.empty and date <= _yesterday():
+            self.shares[date] = shares
+        return shares
+
+    def get_names(self, tickers, fetch_func):
+        """
+        Names of the given tickers; fetch_func(tickers) is called for unknown ones only.
+        """
+        missing = [t for t in tickers if t not in self.names]
+        if missing:
+            self.names.update(zip(missing, fetch_func(missing)))
+        return [self.names[t] for t in tickers]
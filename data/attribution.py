@@ -0,0 +1,75 @@
+"""
+Daily (time-varying) performance attribution (no Qt, no I/O).
+
+Instead of one start-date basket times each constituent's full-period
+return, every trading day uses the basket held at the previous close and
+that day's constituent returns, so rebalances are reflected. Daily
+contributions are linked geometrically: a day's contribution is scaled by
+the basket's growth up to the previous day, so the linked contributions add
+up exactly to the compounded basket return.
+"""
+import numpy as np
+import pandas as pd
+
+def weight_matrix(pdfs, weight_col, dates):
+    """
+    Builds a date x ticker matrix of basket weights (fraction) from
+    {date (YYYYMMDD): PDF}. Days whose PDF is missing keep the previous
+    basket; tickers not held on a day have weight 0.
+    """
+    weights = {}
+    for date, pdf in pdfs.items():
+        if pdf.empty or weight_col not in pdf.columns:
+            continue
+        # A ticker can appear on several lines (e.g. cash), weights add up
+        weights[pd.Timestamp(date)] = pdf[weight_col].astype(float).groupby(level=0).sum() / 100
+    if not weights:
+        return pd.DataFrame(index=dates, dtype=float)
+    matrix = pd.DataFrame(weights).T.sort_index()
+    return matrix.reindex(dates, method='ffill').fillna(0.0)
+
+def daily_return_matrix(closes, changes):
+    """
+    Date x ticker matrix of daily returns (fraction) from the snapshot closes
+    and KRX's '등락률' (%) at each date. The close ratio is kept where it agrees
+    with '등락률' (which is rounded to 0.01%p); on a split or bonus-issue day
+    the unadjusted close drops while '등락률' is computed against the adjusted
+    base price, so '등락률' is used there. A day without a previous close
+    (listing day) has no return. The first row is NaN.
+    """
+    c = closes.to_numpy(dtype=float)
+    c = np.where(c > 0, c, np.nan)
+    k = changes.to_numpy(dtype=float)[1:] / 100
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r = c[1:] / c[:-1] - 1
+    r = np.where(np.isnan(k) | (np.abs(r - k) <= 1e-4), r, k)
+    r = np.where(np.isfinite(c[:-1]) & np.isfinite(c[1:]), r, np.nan)
+    r = np.vstack([np.full((1, r.shape[1]), np.nan), r])
+    return pd.DataFrame(r, index=closes.index, columns=closes.columns)
+
+def linked_attribution(weights, returns):
+    """
+    Daily attribution over the dates of weights / returns (same index and columns).
+
+    weights: basket weights (fraction) at each date's close
+    returns: constituent returns (fraction) from the previous date's close to
+             each date's close (see daily_return_matrix); the first row is ignored
+
+    Returns a DataFrame (index=ticker) with 'Return' (%, compounded over the
+    period) and 'Contribution' (%, geometrically linked daily contributions).
+    """
+    w = weights.to_numpy(dtype=float)
+    r = returns.to_numpy(dtype=float)[1:]
+
+    # Missing or unpriced constituents contribute nothing that day
+    priced = np.isfinite(r)
+    r = np.where(priced, r, 0.0)
+
+    # Day t return of the basket held at close t-1: one weight x return product per row
+    daily = w[:-1] * r
+    basket = daily.sum(axis=1)
+    growth = np.concatenate([[1.0], np.cumprod(1 + basket)[:-1]])
+    contribution = (daily * growth[:, None]).sum(axis=0) * 100
+
+    compounded = np.where(priced.any(axis=0), (np.prod(1 + r, axis=0) - 1) * 100, np.nan)
+    return pd.DataFrame({'Return': compounded, 'Contribution': contribution}, index=weights.columns)
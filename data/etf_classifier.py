@@ -0,0 +1,144 @@
+import re
+import numpy as np
+import pandas as pd
+
+# Keyword tables: keyword -> label, grouped by dimension.
+# Every keyword of every dimension is compiled into one regex, so a name is
+# scanned once regardless of how many keywords there are.
+REGION_KEYWORDS = {
+    "US": ["미국", "S&P", "나스닥", "NASDAQ", "NYSE", "FANG", "팡플러스"],
+    "China": ["China", "중국", "Shenzhen", "심천", "CSI"],
+    "HongKong": ["HongKong", "홍콩", "HangSeng", "항셍"],
+    "Japan": ["Japan", "일본"],
+    "Vietnam": ["Vietnam", "베트남"],
+    "India": ["India", "인도"],
+    "Europe": ["Euro", "유로", "STOXX"],
+    "LatinAmerica": ["Latin", "라틴", "Brazil", "브라질"],
+    "Russia": ["Russia", "러시아"],
+    "Global": ["Global", "글로벌", "MSCI", "Bloomberg", "블룸버그", "Solactive", "Morningstar", "모닝스타"],
+}
+
+BOND_KEYWORDS = {
+    "Bond": ["채권", "국채", "국고채", "단기채", "회사채", "Bond", "Treasury", "KOFR", "CD금리"],
+}
+
+# Order matters: "인버스2X" is an inverse product, so Inverse wins over Leveraged
+LEVERAGE_KEYWORDS = {
+    "Inverse": ["인버스", "Inverse"],
+    "Leveraged": ["레버리지", "Leverage", "2X"],
+}
+
+SECTOR_KEYWORDS = {
+    "Semiconductor": ["반도체"],
+    "Battery": ["2차전지", "이차전지", "배터리"],
+    "Healthcare": ["바이오", "헬스케어", "제약"],
+    "Financials": ["은행", "금융", "증권", "보험"],
+    "IT": ["IT", "소프트웨어", "인터넷"],
+    "Automobile": ["자동차"],
+    "Construction": ["건설"],
+    "Energy": ["에너지"],
+    "Chemicals": ["화학"],
+    "Materials": ["철강", "소재"],
+    "Shipbuilding": ["조선"],
+    "Media": ["미디어", "엔터", "게임"],
+    "Consumer": ["필수소비재", "경기소비재", "소비재"],
+    "REITs": ["리츠", "REITs"],
+}
+
+DIMENSIONS = {
+    "region": REGION_KEYWORDS,
+    "bond": BOND_KEYWORDS,
+    "leverage": LEVERAGE_KEYWORDS,
+    "sector": SECTOR_KEYWORDS,
+}
+
+def _build_lookup():
+    lookup = {}
+    for dimension, table in DIMENSIONS.items():
+        for rank, (label, keywords) in enumerate(table.items()):
+            # Only leverage has a priority between labels, elsewhere the first match wins
+            priority = rank if dimension == "leverage" else 0
+            for kw in keywords:
+                lookup.setdefault(kw, []).append((dimension, label, priority))
+    return lookup
+
+KEYWORD_LOOKUP = _build_lookup()
+
+def _keyword_pattern(kw):
+    # Short Latin keywords must stand alone, otherwise "IT" matches inside "MERITZ"
+    if len(kw) <= 3 and kw.isascii() and kw.isalpha():
+        return f"(?<![A-Za-z]){re.escape(kw)}(?![A-Za-z])"
+    return re.escape(kw)
+
+# Zero-width lookahead so overlapping keywords are all reported
+# (e.g. "미국채" matches both "미국" and "국채"); longest keyword first.
+PATTERN = re.compile(
+    "(?=(" + "|".join(_keyword_pattern(kw) for kw in sorted(KEYWORD_LOOKUP, key=len, reverse=True)) + "))"
+)
+
+COLUMNS = ["category", "region", "bond", "leverage", "sector"]
+
+def _category(region, is_bond):
+    # Same precedence as the original keyword loops: Foreign, then Bond
+    if region is not None:
+        return "Foreign"
+    if is_bond:
+        return "Bond"
+    return "Domestic"
+
+def classify(name):
+    """
+    Classifies one ETF name.
+    Returns a dict with category ("Domestic"/"Foreign"/"Bond"), region,
+    bond (bool), leverage ("Leveraged"/"Inverse") and sector.
+    """
+    found = {}
+    for kw in PATTERN.findall(name):
+        for dimension, label, priority in KEYWORD_LOOKUP[kw]:
+            if dimension not in found or priority < found[dimension][1]:
+                found[dimension] = (label, priority)
+
+    region = found.get("region", (None,))[0]
+    is_bond = "bond" in found
+    return {
+        "category": _category(region, is_bond),
+        "region": region,
+        "bond": is_bond,
+        "leverage": found.get("leverage", (None,))[0],
+        "sector": found.get("sector", (None,))[0],
+    }
+
+def classify_names(names):
+    """
+    Classifies a whole Series of ETF names at once.
+    Returns a DataFrame (same index as names) with the columns of classify().
+    """
+    names = pd.Series(names)
+    positions = pd.RangeIndex(len(names))
+
+    # One regex pass per name, then pure table operations
+    matches = pd.Series(names.astype(str).str.findall(PATTERN).values, index=positions)
+    hits = matches.explode().dropna()
+    hits = hits.map(KEYWORD_LOOKUP).explode()
+
+    hits_df = pd.DataFrame(hits.tolist(), columns=["dimension", "label", "priority"], index=hits.index)
+    hits_df.index.name = "row"
+    hits_df = hits_df.reset_index()
+    hits_df["order"] = np.arange(len(hits_df))
+
+    first = (hits_df.sort_values(["row", "dimension", "priority", "order"])
+             .drop_duplicates(["row", "dimension"])
+             .pivot(index="row", columns="dimension", values="label")
+             .reindex(index=positions, columns=list(DIMENSIONS)))
+
+    result = pd.DataFrame(index=positions)
+    result["region"] = first["region"]
+    result["bond"] = first["bond"].notna()
+    result["leverage"] = first["leverage"]
+    result["sector"] = first["sector"]
+    result["category"] = np.where(
+        result["region"].notna(), "Foreign", np.where(result["bond"], "Bond", "Domestic")
+    )
+    result = result[COLUMNS].astype(object).where(result[COLUMNS].notna(), None)
+    result.index = names.index
+    return result
@@ -1,60 +1,190 @@
-from pykrx import stock
 import pandas as pd
-import time
-import yfinance as yf
-import datetime
+from data import sources
+from data.sources import stock
+from data.price_cache import PriceCache
+from data.pdf_store import PDFStore
+from data.fetch_executor import get_executor
+from data.name_index import NameIndex
+from data.etf_universe import ETFUniverse
+from data.etf_classifier import classify
+from data.listing_dates import ListingDateIndex
+from data.trading_calendar import get_calendar
+from data.tracing import span
+
+def close_returns(start_close, end_close, tickers):
+    """
+    Period returns (%) of the given tickers between two by-ticker close
+    Series (e.g. the '종가' of two market snapshots). Missing tickers get NaN.
+    """
+    start_close = start_close.astype(float).replace(0, float("nan"))
+    returns = (end_close.astype(float) / start_close - 1) * 100
+    return returns.reindex([str(t) for t in tickers]).set_axis(tickers).rename("Return")
+
+def corporate_action_tickers(start_close, end_close, start_shares, end_shares, tickers):
+    """
+    Tickers whose period return cannot come from two unadjusted snapshot
+    closes: traded on the end day but not on the start day (listed inside the
+    window), or whose listed share count changed in between (split, bonus
+    issue, merger). Share counts are by-ticker Series and may be empty.
+    """
+    keys = [str(t) for t in tickers]
+    start_close, end_close = start_close.reindex(keys), end_close.reindex(keys)
+    start_shares, end_shares = start_shares.reindex(keys), end_shares.reindex(keys)
+    listed_later = (start_close.isna() | (start_close == 0)) & end_close.notna()
+    shares_changed = start_shares.notna() & end_shares.notna() & (start_shares != end_shares)
+    flagged = [t for t, flag in zip(tickers, (listed_later | shares_changed).to_numpy()) if flag]
+    return list(dict.fromkeys(flagged))
 
 class ETFDataFetcher:
     def __init__(self):
-        pass
+        # Local OHLCV store, only missing date ranges go to pykrx
+        self.price_cache = PriceCache()
+        # Shared rate limiter / retry policy for every request
+        self.executor = get_executor()
+        # Dates are snapped to KRX trading days before any request
+        self.calendar = get_calendar()
+        # Bulk ticker -> name dictionary (one pass per trading day)
+        self.name_index = NameIndex()
+        # Daily pre-classified ETF listing
+        self.universe = ETFUniverse()
+        # Local listing-date index for the whole ETF universe
+        self.listing_dates = ListingDateIndex()
+        # Local delta-encoded daily PDF history
+        self.pdf_store = PDFStore()
         
+    def _get_history(self, kind, ticker, start_date, end_date, source):
+        """
+        Snaps the range to trading days and serves it from the price cache,
+        calling source(start, end, ticker) only for the missing ranges.
+        """
+        with span(f"{kind}_history") as stage:
+            start, end = self.calendar.snap_range(start_date, end_date)
+            if start is None:
+                # No trading day in the range, nothing to request
+                return pd.DataFrame()
+            df = self.price_cache.get(
+                kind, ticker, start, end,
+                lambda s, e: self._fetch_history(kind, source, s, e, ticker)
+            )
+            stage.rows = len(df)
+            return df
+
+    def _fetch_history(self, kind, source, start, end, ticker):
+        # An index trades on every trading day, so an empty answer for a range
+        # with a completed trading day is a failed request and is retried.
+        # ETFs and stocks can legitimately be empty there (not listed yet).
+        if kind == "index" and self.has_completed_trading_day(start, end):
+            return self.executor.call_nonempty(source, start, end, ticker)
+        return self.executor.call(source, start, end, ticker)
+
+    def has_completed_trading_day(self, start_date, end_date):
+        """
+        True if [start_date, end_date] holds a trading day before today,
+        i.e. a day whose market data must exist.
+        """
+        today = sources.today().strftime("%Y%m%d")
+        days = self.calendar.trading_days_between(start_date, min(end_date, today))
+        return bool(days) and days[0] < today
+
     def get_etf_price_history(self, ticker, start_date, end_date):
         """
         Fetches daily OHLCV for the given ETF ticker.
         """
         try:
             # pykrx expects dates in YYYYMMDD format
-            df = stock.get_etf_ohlcv_by_date(start_date, end_date, ticker)
+            df = self._get_history("etf", ticker, start_date, end_date, stock.get_etf_ohlcv_by_date)
             return df
         except Exception as e:
             print(f"Error fetching ETF history: {e}")
             return pd.DataFrame()
             
-    def get_etf_pdf(self, ticker, date):
+    def get_etf_pdf(self, ticker, date, listed=False):
         """
         Fetches Portfolio Deposit File (PDF) for the ETF on a specific date.
+        Served from the local PDF store; only missing dates are downloaded.
+        listed: the ETF is known to be listed on date, so an empty PDF of a
+        past trading day is a failed request and is retried.
         """
         try:
-            df = stock.get_etf_portfolio_deposit_file(ticker, date)
+            with span("pdf") as s:
+                call = self.executor.call
+                if listed and self.has_completed_trading_day(date, date):
+                    call = self.executor.call_nonempty
+                df = self.pdf_store.get(
+                    ticker, date,
+                    lambda d: call(stock.get_etf_portfolio_deposit_file, ticker, d)
+                )
+                s.rows = len(df)
             return df
         except Exception as e:
             print(f"Error fetching PDF: {e}")
             return pd.DataFrame()
 
+    def _download_pdf(self, ticker, date):
+        try:
+            return self.executor.call(stock.get_etf_portfolio_deposit_file, ticker, date)
+        except Exception as e:
+            print(f"Error fetching PDF for {date}: {e}")
+            return pd.DataFrame()
+
+    def get_pdf_history(self, ticker, dates):
+        """
+        Returns {date: PDF} for the given trading days. Dates missing from the
+        local PDF store are downloaded concurrently and stored in one pass
+        (do not call this from a pool job).
+        """
+        if not dates:
+            return {}
+        try:
+            with span("pdf_history") as s:
+                downloaded = {}
+                def fetch_many(missing):
+                    pdfs = self.executor.map(lambda d: self._download_pdf(ticker, d), missing)
+                    downloaded.update(zip(missing, pdfs))
+                    return pdfs
+
+                self.pdf_store.backfill(ticker, dates, fetch_many)
+                stored = self.pdf_store.scan(ticker, min(dates), max(dates))
+                # Today's PDF is not stored, it comes from the download
+                history = {d: stored.get(d, downloaded.get(d, pd.DataFrame())) for d in dates}
+                s.rows = len(history)
+            return history
+        except Exception as e:
+            print(f"Error fetching PDF history: {e}")
+            return {d: pd.DataFrame() for d in dates}
+
     def get_ticker_name(self, ticker):
         try:
-            return stock.get_etf_ticker_name(ticker)
+            return self.executor.call(stock.get_etf_ticker_name, ticker)
         except:
             return ticker
 
     def get_stock_name(self, ticker):
         try:
             # Try stock name first
-            name = stock.get_market_ticker_name(ticker)
+            name = self.executor.call(stock.get_market_ticker_name, ticker)
             if not name:
                 # If empty, maybe it's an ETF?
-                name = stock.get_etf_ticker_name(ticker)
+                name = self.executor.call(stock.get_etf_ticker_name, ticker)
             return name if name else ticker
         except:
             return ticker
 
+    def get_stock_names(self, tickers, date):
+        """
+        Resolves names for many tickers at once from the daily name index.
+        """
+        with span("names") as s:
+            s.rows = len(tickers)
+            return self.name_index.map(tickers, date)
+
     def get_benchmark_data(self, start_date, end_date, ticker="1001"):
         """
         Fetches benchmark data (default: KOSPI).
         Ticker 1001 is KOSPI in pykrx.
         """
         try:
-            df = stock.get_index_ohlcv_by_date(start_date, end_date, ticker)
+            df = self._get_history("index", ticker, start_date, end_date, stock.get_index_ohlcv_by_date)
             return df
         except Exception as e:
             print(f"Error fetching benchmark: {e}")
@@ -65,100 +195,125 @@ class ETFDataFetcher:
         Fetches price history for a specific stock (constituent).
         """
         try:
-            # Add a small delay to avoid rate limiting if called in a loop
-            time.sleep(0.1) 
-            df = stock.get_market_ohlcv_by_date(start_date, end_date, ticker)
+            df = self._get_history("stock", ticker, start_date, end_date, stock.get_market_ohlcv_by_date)
             return df
         except Exception as e:
             print(f"Error fetching stock history for {ticker}: {e}")
             return pd.DataFrame()
 
+    def get_market_snapshot(self, date):
+        """
+        Fetches OHLCV of every KOSPI/KOSDAQ/KONEX stock on a single trading day.
+        Non-trading days are snapped back to the previous trading day.
+        """
+        try:
+            with span("snapshot") as s:
+                date = self.calendar.previous_trading_day(date)
+                # A past trading day's snapshot is never empty, only today's may not be published yet
+                call = self.executor.call_nonempty if self.has_completed_trading_day(date, date) else self.executor.call
+                df = self.price_cache.get_snapshot(
+                    "market", date, lambda d: call(stock.get_market_ohlcv_by_ticker, d, market="ALL")
+                )
+                s.rows = len(df)
+            return df
+        except Exception as e:
+            print(f"Error fetching market snapshot for {date}: {e}")
+            return pd.DataFrame()
+
+    def get_listed_shares(self, date):
+        """
+        Listed share count (상장주식수) of every stock on a single trading day.
+        """
+        try:
+            with span("listed_shares") as s:
+                date = self.calendar.previous_trading_day(date)
+                call = self.executor.call_nonempty if self.has_completed_trading_day(date, date) else self.executor.call
+                df = self.price_cache.get_snapshot(
+                    "cap", date, lambda d: call(stock.get_market_cap_by_ticker, d, market="ALL")
+                )
+                s.rows = len(df)
+            return df['상장주식수'] if '상장주식수' in df.columns else pd.Series(dtype=float)
+        except Exception as e:
+            print(f"Error fetching listed shares for {date}: {e}")
+            return pd.Series(dtype=float)
+
+    def get_adjusted_returns(self, tickers, start_date, end_date):
+        """
+        Period returns (%) from adjusted daily history, first to last price in
+        the window (so a stock listed inside it starts from its first price).
+        One request per ticker, run concurrently (do not call this from a pool job).
+        Adjusted prices are rewritten after every split, so they are not cached.
+        """
+        def period_return(ticker):
+            try:
+                df = self.executor.call(stock.get_market_ohlcv_by_date, start_date, end_date, ticker)
+            except Exception as e:
+                print(f"Error fetching adjusted history for {ticker}: {e}")
+                return float("nan")
+            closes = df['종가'].astype(float).replace(0, float("nan")).dropna() if not df.empty else df
+            if len(closes) == 0:
+                return float("nan")
+            return (closes.iloc[-1] / closes.iloc[0] - 1) * 100
+
+        with span("adjusted_returns") as s:
+            s.rows = len(tickers)
+            return pd.Series(self.executor.map(period_return, tickers), index=tickers, dtype=float)
+
+    def get_constituent_returns(self, tickers, start_date, end_date):
+        """
+        Returns period returns (%) for the given stock tickers, computed from two
+        market-wide snapshots (start and end trading day) instead of one
+        history request per stock. Stocks with a corporate action or listed
+        inside the window fall back to adjusted history; tickers not found in
+        the market get NaN.
+        """
+        with span("constituent_returns") as s:
+            s.rows = len(tickers)
+            # Snapshots are fetched concurrently (do not call this from a pool job)
+            start_snap, end_snap = self.executor.map(self.get_market_snapshot, [start_date, end_date])
+            if start_snap.empty or end_snap.empty:
+                return pd.Series(float("nan"), index=tickers)
+            start_shares, end_shares = self.executor.map(self.get_listed_shares, [start_date, end_date])
+            returns = close_returns(start_snap['종가'], end_snap['종가'], tickers)
+            recheck = corporate_action_tickers(
+                start_snap['종가'], end_snap['종가'], start_shares, end_shares, tickers
+            )
+            if recheck:
+                mask = returns.index.isin(recheck)
+                returns[mask] = self.get_adjusted_returns(recheck, start_date, end_date).reindex(returns.index[mask]).values
+            return returns
+
     def get_listing_date(self, ticker):
         """
         Returns the listing date (first trading date) of the ETF.
-        Optimized to use yfinance metadata for speed.
+        Served from the local listing-date index; misses race yfinance and pykrx.
         """
         try:
-            # Helper to fetch date from yfinance
-            def fetch_yf_date(symbol):
-                yf_ticker = yf.Ticker(symbol)
-                
-                # 1. Try info (most accurate "First Trade Date")
-                try:
-                    info = yf_ticker.info
-                    if 'firstTradeDateMilliseconds' in info:
-                        ts_ms = info['firstTradeDateMilliseconds']
-                        dt = datetime.datetime.fromtimestamp(ts_ms / 1000)
-                        return dt.strftime("%Y-%m-%d")
-                except Exception as e:
-                    # print(f"Info fetch failed for {symbol}: {e}")
-                    pass
-                
-                # 2. Try history metadata (backup, often faster or available when info is partial)
-                try:
-                    meta = yf_ticker.get_history_metadata()
-                    if 'firstTradeDate' in meta:
-                        ts = meta['firstTradeDate']
-                        # This is usually seconds timestamp
-                        dt = datetime.datetime.fromtimestamp(ts)
-                        return dt.strftime("%Y-%m-%d")
-                except Exception as e:
-                    # print(f"Metadata fetch failed for {symbol}: {e}")
-                    pass
-                    
-                return None
-
-            # 1. Handle existing suffix
-            if "." in ticker:
-                date = fetch_yf_date(ticker)
-                if date: return date
-            
-            # 2. Try .KS (KOSPI/KOSDAQ ETFs usually use .KS in Yahoo)
-            date = fetch_yf_date(f"{ticker}.KS")
-            if date: return date
-
-            # 3. Try .KQ (Just in case some KOSDAQ ETFs use this)
-            date = fetch_yf_date(f"{ticker}.KQ")
-            if date: return date
-            
-            # Fallback to old method if yfinance fails
-            print(f"yfinance failed for {ticker}, falling back to pykrx...")
-            df = stock.get_etf_ohlcv_by_date("20020101", "20251231", ticker)
-            if not df.empty:
-                return df.index[0].strftime("%Y-%m-%d")
-            return None
+            with span("listing_date"):
+                return self.listing_dates.get(ticker)
         except Exception as e:
             print(f"Error fetching listing date: {e}")
             return None
 
+    def get_etf_category(self, name):
+        """
+        Classifies an ETF by name: "Foreign", "Bond" or "Domestic" (equity).
+        """
+        return classify(name)['category']
+
     def is_target_etf(self, name):
         """
         Checks if the ETF is a target for analysis (Domestic Equity).
         Excludes Foreign tracking and Bond ETFs.
         """
-        # 1. Filter Foreign
-        foreign_keywords = [
-            "미국", "S&P", "나스닥", "NASDAQ", "China", "중국", "HongKong", "홍콩", 
-            "Japan", "일본", "Vietnam", "베트남", "India", "인도", "Euro", "유로", 
-            "Global", "글로벌", "MSCI", "Latin", "라틴", "Brazil", "브라질", 
-            "Russia", "러시아", "Shenzhen", "심천", "CSI", "HangSeng", "항셍",
-            "Bloomberg", "블룸버그", "Solactive", "STOXX", "Morningstar", "모닝스타",
-            "NYSE", "FANG", "팡플러스"
-        ]
-        
-        for kw in foreign_keywords:
-            if kw in name:
-                return False
-
-        # 2. Filter Bonds
-        bond_keywords = [
-            "채권", "국채", "국고채", "단기채", "회사채", "Bond", "Treasury", "KOFR", "CD금리"
-        ]
-        for kw in bond_keywords:
-            if kw in name:
-                return False
-                
-        return True
+        return self.get_etf_category(name) == "Domestic"
+
+    def get_etf_universe(self, date=None):
+        """
+        Returns the daily ETF universe snapshot
+        (index=ticker, columns=['name', 'category', 'region', 'bond', 'leverage', 'sector']).
+        """
+        return self.universe.load(date)
 
     def get_all_etf_list(self):
         """
@@ -166,18 +321,10 @@ class ETFDataFetcher:
         Filters out Foreign and Bond ETFs.
         """
         try:
-            # Get all tickers (defaults to today)
-            tickers = stock.get_etf_ticker_list()
-            
-            etf_list = []
-            for ticker in tickers:
-                name = stock.get_etf_ticker_name(ticker)
-                
-                if not self.is_target_etf(name):
-                    continue
-                        
-                etf_list.append(f"{ticker} | {name}")
-            return etf_list
+            # Cached daily snapshot, category is already classified
+            universe = self.get_etf_universe()
+            domestic = universe[universe['category'] == "Domestic"]
+            return (domestic.index + " | " + domestic['name']).tolist()
         except Exception as e:
             print(f"Error fetching ETF list: {e}")
             return []
@@ -0,0 +1,112 @@
+import threading
+import pandas as pd
+from data import sources
+from data.sources import etx
+from data.local_store import connect, db_lock
+from data.fetch_executor import get_executor
+from data.etf_classifier import classify_names, COLUMNS
+
+class ETFUniverse:
+    """
+    Daily snapshot of the listed ETF universe: ticker (index), name and the
+    classifier columns (category, region, bond, leverage, sector).
+    Built once per day, stored in the local cache and reused by every
+    search / filter afterwards. The category column is precomputed, so
+    filtering is a column lookup instead of a keyword rescan.
+    """
+    DB_NAME = "universe.sqlite"
+
+    # Loaded snapshots shared by every instance (date -> DataFrame)
+    _memory = {}
+    _memory_lock = threading.Lock()
+
+    def __init__(self):
+        self.executor = get_executor()
+        with db_lock:
+            conn = connect(self.DB_NAME)
+            try:
+                columns = [row[1] for row in conn.execute("PRAGMA table_info(universe)")]
+                if columns and "region" not in columns:
+                    # Snapshot stored before the classifier columns existed, rebuild it
+                    conn.execute("DROP TABLE universe")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS universe ("
+                    "date TEXT, ticker TEXT, name TEXT, category TEXT, "
+                    "region TEXT, bond INTEGER, leverage TEXT, sector TEXT)"
+                )
+                conn.commit()
+            finally:
+                conn.close()
+
+    def load(self, date=None):
+        """
+        Returns the universe snapshot for the given date (default: today).
+        """
+        date = date or sources.today().strftime("%Y%m%d")
+        with self._memory_lock:
+            if date in self._memory:
+                return self._memory[date]
+
+        df = self._load(date)
+        if df.empty:
+            try:
+                df = self._build(date)
+                self._save(date, df)
+            except Exception as e:
+                print(f"Error building ETF universe for {date}: {e}")
+        if df.empty:
+            # Offline: fall back to the latest stored snapshot
+            df = self._load_latest()
+
+        if not df.empty:
+            with self._memory_lock:
+                self._memory[date] = df
+        return df
+
+    def _build(self, date):
+        # ETFs listed on date, with their names, from pykrx's ETF master listing
+        # (one request; the same table get_etf_ticker_list() filters)
+        listing = self.executor.call(lambda: etx.EtxTicker().df)
+        listing = listing[(listing['시장'] == 'ETF') & (listing['상장일'] <= date)]
+        df = pd.DataFrame({'name': listing['종목명']}).rename_axis('ticker')
+        # Whole universe classified in one vectorized pass
+        return df.join(classify_names(df['name']))
+
+    def _load(self, date):
+        with db_lock:
+            conn = connect(self.DB_NAME)
+            try:
+                df = pd.read_sql(
+                    "SELECT * FROM universe WHERE date=? ORDER BY rowid",
+                    conn, params=(date,)
+                )
+            finally:
+                conn.close()
+        df = df.drop(columns="date").set_index("ticker")
+        df['bond'] = df['bond'].astype(bool)
+        return df
+
+    def _load_latest(self):
+        with db_lock:
+            conn = connect(self.DB_NAME)
+            try:
+                row = conn.execute("SELECT MAX(date) FROM universe").fetchone()
+            finally:
+                conn.close()
+        if row[0] is None:
+            return pd.DataFrame(columns=['name'] + COLUMNS)
+        return self._load(row[0])
+
+    def _save(self, date, df):
+        if df.empty:
+            return
+        rows = df.reset_index()
+        rows.insert(0, "date", date)
+        with db_lock:
+            conn = connect(self.DB_NAME)
+            try:
+                conn.execute("DELETE FROM universe WHERE date=?", (date,))
+                rows.to_sql("universe", conn, if_exists="append", index=False)
+                conn.commit()
+            finally:
+                conn.close()
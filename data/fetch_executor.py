@@ -0,0 +1,118 @@
+import contextvars
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Transient failures worth retrying: network errors (requests' exceptions are
+# OSError subclasses) and truncated/throttled JSON responses (yfinance).
+# Anything else (e.g. KeyError for an unknown ticker) is raised immediately.
+# pykrx catches its own request/parse errors and returns an empty DataFrame
+# instead, so for pykrx only call_nonempty() retries.
+RETRYABLE_ERRORS = (OSError, json.JSONDecodeError)
+
+class TokenBucket:
+    """
+    Token bucket rate limiter.
+    Allows bursts of up to `capacity` requests, refilled at `rate` tokens per second.
+    """
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity else max(1.0, rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Blocks until a token is available and consumes it.
+        """
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+class FetchExecutor:
+    """
+    Shared executor for pykrx/yfinance requests.
+
+    - call(): runs a single request in the calling thread, rate limited by the
+      token bucket and retried with exponential backoff on exceptions.
+    - submit()/map(): run fetch jobs concurrently on a bounded thread pool.
+
+    Jobs running on the pool should only use call() for their requests
+    (never wait on other submitted jobs) so the pool cannot deadlock.
+    """
+    def __init__(self, max_workers=None, rate=None, burst=None, retries=3, backoff=0.5):
+        max_workers = max_workers or int(os.environ.get("ETF_FETCH_WORKERS", 8))
+        rate = rate or float(os.environ.get("ETF_FETCH_RATE", 20))
+        burst = burst or float(os.environ.get("ETF_FETCH_BURST", rate))
+
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fetch")
+        self.limiter = TokenBucket(rate, burst)
+        self.retries = retries
+        self.backoff = backoff
+
+    def call(self, func, *args, **kwargs):
+        """
+        Calls func(*args, **kwargs) under the rate limit, retrying transient failures.
+        """
+        return self._call(func, args, kwargs, retry_empty=False)
+
+    def call_nonempty(self, func, *args, **kwargs):
+        """
+        Like call(), for requests whose result can never be legitimately empty
+        (e.g. a whole-market snapshot of a past trading day): an empty
+        DataFrame is how pykrx reports a failed request, so it is retried too.
+        The last (empty) result is returned once the retries are used up.
+        """
+        return self._call(func, args, kwargs, retry_empty=True)
+
+    def _call(self, func, args, kwargs, retry_empty):
+        for attempt in range(self.retries + 1):
+            self.limiter.acquire()
+            try:
+                result = func(*args, **kwargs)
+                if not (retry_empty and getattr(result, 'empty', False)) or attempt == self.retries:
+                    return result
+            except RETRYABLE_ERRORS:
+                if attempt == self.retries:
+                    raise
+            # Exponential backoff with jitter
+            time.sleep(self.backoff * (2 ** attempt) * (1 + random.random()))
+
+    def submit(self, func, *args, **kwargs):
+        """
+        Runs func(*args, **kwargs) on the pool and returns a Future.
+        The caller's context (open tracing spans) is carried into the job.
+        """
+        context = contextvars.copy_context()
+        return self.pool.submit(context.run, func, *args, **kwargs)
+
+    def map(self, func, items):
+        """
+        Runs func(item) for every item concurrently, results in input order.
+        """
+        futures = [self.submit(func, item) for item in items]
+        return [f.result() for f in futures]
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def get_executor():
+    """
+    Returns the process-wide FetchExecutor (created on first use).
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = FetchExecutor()
+        return _executor
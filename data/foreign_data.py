@@ -1,9 +1,18 @@
-import yfinance as yf
 import pandas as pd
+from data.sources import yf
+from data.fetch_executor import get_executor
+from data.ttl_cache import TTLCache
+from data.tracing import span
+
+# Fund holdings / sector weights / info change at most daily
+METADATA_TTL = 24 * 60 * 60
 
 class ForeignDataFetcher:
     def __init__(self):
-        pass
+        # Shared rate limiter / retry policy for every request
+        self.executor = get_executor()
+        # Persistent cache for the slow metadata endpoints
+        self.cache = TTLCache()
         
     def get_price_history(self, ticker_symbol, start_date, end_date):
         """
@@ -12,32 +21,92 @@ class ForeignDataFetcher:
         try:
             ticker = yf.Ticker(ticker_symbol)
             # yfinance expects YYYY-MM-DD
-            df = ticker.history(start=start_date, end=end_date)
+            df = self.executor.call(ticker.history, start=start_date, end=end_date)
             return df
         except Exception as e:
             print(f"Error fetching history for {ticker_symbol}: {e}")
             return pd.DataFrame()
 
+    def get_price_histories(self, symbols, start_date, end_date):
+        """
+        Fetch closes for many tickers in one multi-symbol request.
+        Returns a DataFrame (index=date, columns=symbols); missing symbols are all NaN.
+        """
+        symbols = list(dict.fromkeys(str(s).upper() for s in symbols))
+        try:
+            with span("histories") as s:
+                df = self.executor.call(
+                    yf.download, symbols, start=start_date, end=end_date,
+                    auto_adjust=True, progress=False
+                )
+                if isinstance(df.columns, pd.MultiIndex):
+                    closes = df['Close']
+                else:
+                    closes = df[['Close']].set_axis(symbols[:1], axis=1)
+                s.rows = closes.size
+            return closes.reindex(columns=symbols)
+        except Exception as e:
+            print(f"Error fetching histories for {symbols}: {e}")
+            return pd.DataFrame(columns=symbols)
+
+    def get_period_returns(self, closes):
+        """
+        Period return (%) of every column from its first to its last valid close.
+        """
+        first = closes.bfill().iloc[0] if not closes.empty else pd.Series(dtype=float)
+        last = closes.ffill().iloc[-1] if not closes.empty else pd.Series(dtype=float)
+        return (last / first - 1) * 100
+
     def get_top_holdings(self, ticker_symbol):
         """
-        Fetch top holdings for an ETF.
+        Fetch top holdings for an ETF (cached for a day).
         Returns a DataFrame with index=Symbol, columns=['Name', 'Weight']
         """
         try:
-            ticker = yf.Ticker(ticker_symbol)
-            if hasattr(ticker, 'funds_data'):
-                fd = ticker.funds_data
-                if hasattr(fd, 'top_holdings'):
-                    # top_holdings is already a DataFrame usually
-                    return fd.top_holdings
-            return pd.DataFrame()
+            with span("holdings") as s:
+                holdings = self.cache.get_or_fetch(
+                    f"holdings:{ticker_symbol.upper()}", METADATA_TTL,
+                    lambda: self._fetch_funds_data(ticker_symbol, 'top_holdings')
+                )
+                s.rows = len(holdings) if holdings is not None else 0
+            return holdings if holdings is not None else pd.DataFrame()
         except Exception as e:
             print(f"Error fetching holdings for {ticker_symbol}: {e}")
             return pd.DataFrame()
 
-    def get_stock_name(self, ticker_symbol):
+    def get_sector_weights(self, ticker_symbol):
+        """
+        Fetch sector weightings of an ETF (cached for a day).
+        Returns a dict {sector: weight}
+        """
         try:
-            ticker = yf.Ticker(ticker_symbol)
-            return ticker.info.get('shortName', ticker_symbol)
-        except:
-            return ticker_symbol
+            return self.cache.get_or_fetch(
+                f"sectors:{ticker_symbol.upper()}", METADATA_TTL,
+                lambda: self._fetch_funds_data(ticker_symbol, 'sector_weightings')
+            ) or {}
+        except Exception as e:
+            print(f"Error fetching sector weights for {ticker_symbol}: {e}")
+            return {}
+
+    def get_info(self, ticker_symbol):
+        """
+        Fetch the yfinance .info dict of a ticker (cached for a day).
+        """
+        try:
+            return self.cache.get_or_fetch(
+                f"info:{ticker_symbol.upper()}", METADATA_TTL,
+                lambda: self.executor.call(lambda: yf.Ticker(ticker_symbol).info)
+            ) or {}
+        except Exception as e:
+            print(f"Error fetching info for {ticker_symbol}: {e}")
+            return {}
+
+    def get_stock_name(self, ticker_symbol):
+        return self.get_info(ticker_symbol).get('shortName', ticker_symbol)
+
+    def _fetch_funds_data(self, ticker_symbol, field):
+        ticker = yf.Ticker(ticker_symbol)
+        if not hasattr(ticker, 'funds_data'):
+            return None
+        # funds_data fields are fetched lazily on access
+        return self.executor.call(lambda: getattr(ticker.funds_data, field, None))
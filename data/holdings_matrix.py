@@ -0,0 +1,327 @@
+"""
+Sparse ETF x stock holdings matrix of the filtered (domestic equity) universe.
+
+Each row is one ETF's basket weights (fraction) from its PDF on a single
+trading day. Overlap, cosine similarity and "most similar ETFs" queries are
+sparse products / reductions over that matrix, and its column-major copy is
+the reverse index (stock -> ETFs holding it). Once it is built (and saved
+in the cache directory) a query does not download anything.
+"""
+import os
+import threading
+from datetime import timedelta
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from data import sources
+from data.local_store import cache_path
+from data.tracing import span
+
+WEIGHT_COLUMNS = ['비중', 'Weight', 'weight']
+
+def basket_weights(pdf):
+    """
+    Weights (fraction) of one PDF by ticker: the weight column if there is
+    one, otherwise each line's share of the total amount.
+    """
+    if pdf.empty:
+        return pd.Series(dtype=float)
+    for col in WEIGHT_COLUMNS:
+        if col in pdf.columns:
+            weights = pdf[col].astype(float) / 100
+            break
+    else:
+        if '금액' not in pdf.columns:
+            return pd.Series(dtype=float)
+        amounts = pdf['금액'].astype(float)
+        weights = amounts / amounts.sum()
+    weights = weights.groupby(level=0).sum()
+    return weights[weights > 0]
+
+def basket_amounts(pdf, index):
+    """
+    '금액' of one PDF summed by ticker and aligned on index (0 if unknown).
+    """
+    if '금액' not in pdf.columns:
+        return np.zeros(len(index))
+    return pdf['금액'].astype(float).groupby(level=0).sum().reindex(index).fillna(0.0).to_numpy()
+
+class HoldingsMatrix:
+    """
+    etfs: ETF tickers (rows), stocks: stock tickers (columns),
+    weights: scipy.sparse CSR matrix of basket weights (fraction),
+    amounts: CSR matrix of '금액' with the same pattern (optional),
+    names: {ETF ticker: name} (optional),
+    missing: ETFs whose PDF could not be fetched (retried on the next build).
+    """
+    def __init__(self, etfs, stocks, weights, date=None, amounts=None, names=None, missing=None):
+        self.etfs = list(etfs)
+        self.stocks = list(stocks)
+        self.weights = sparse.csr_matrix(weights)
+        self.amounts = sparse.csr_matrix(amounts) if amounts is not None else None
+        self.date = date
+        self.names = dict(names or {})
+        self.missing = list(missing or [])
+        self._rows = {t: i for i, t in enumerate(self.etfs)}
+        self._columns = {t: j for j, t in enumerate(self.stocks)}
+        self._normalized = None
+        # Column-major copies: the reverse (stock -> ETFs) index
+        self._by_stock = self.weights.tocsc()
+        self._amounts_by_stock = self.amounts.tocsc() if self.amounts is not None else None
+
+    @classmethod
+    def from_pdfs(cls, pdfs, date=None, names=None):
+        """
+        Builds the matrix from {etf: PDF}; ETFs with an empty basket are left
+        out and listed in missing.
+        """
+        series = {etf: basket_weights(pdf) for etf, pdf in pdfs.items()}
+        series = {etf: s for etf, s in series.items() if not s.empty}
+        stocks = sorted(set().union(*(s.index for s in series.values()))) if series else []
+        columns = {t: j for j, t in enumerate(stocks)}
+
+        rows, cols, data, amounts = [], [], [], []
+        for i, (etf, s) in enumerate(series.items()):
+            rows.append(np.full(len(s), i))
+            cols.append(np.fromiter((columns[t] for t in s.index), dtype=np.int64, count=len(s)))
+            data.append(s.to_numpy())
+            amounts.append(basket_amounts(pdfs[etf], s.index))
+        shape = (len(series), len(stocks))
+        if series:
+            coords = (np.concatenate(rows), np.concatenate(cols))
+            weights = sparse.csr_matrix((np.concatenate(data), coords), shape=shape)
+            amounts = sparse.csr_matrix((np.concatenate(amounts), coords), shape=shape)
+        else:
+            weights = amounts = sparse.csr_matrix(shape)
+        names = {etf: names[etf] for etf in series if etf in names} if names else None
+        missing = [etf for etf in pdfs if etf not in series]
+        return cls(series.keys(), stocks, weights, date, amounts, names, missing)
+
+    def extend(self, other):
+        """
+        A new matrix with the rows of other appended (other's ETFs must not
+        be rows of this one). ETFs that other fetched are no longer missing.
+        """
+        stocks = sorted(set(self.stocks).union(other.stocks))
+        columns = {t: j for j, t in enumerate(stocks)}
+
+        def remap(matrices):
+            # Moves each matrix onto the merged stock columns and stacks the rows
+            parts = []
+            for m, source in matrices:
+                coo = m.tocoo()
+                index = np.array([columns[t] for t in source], dtype=np.int64)
+                parts.append(sparse.csr_matrix((coo.data, (coo.row, index[coo.col])), shape=(m.shape[0], len(stocks))))
+            return sparse.vstack(parts).tocsr()
+
+        weights = remap([(self.weights, self.stocks), (other.weights, other.stocks)])
+        amounts = None
+        if self.amounts is not None and other.amounts is not None:
+            amounts = remap([(self.amounts, self.stocks), (other.amounts, other.stocks)])
+        missing = [t for t in dict.fromkeys(self.missing + other.missing) if t not in other._rows]
+        return HoldingsMatrix(
+            self.etfs + other.etfs, stocks, weights, self.date, amounts,
+            {**self.names, **other.names}, missing
+        )
+
+    # --- Persistence ---
+
+    @staticmethod
+    def path(date):
+        return cache_path(f"holdings_{date}.npz")
+
+    def save(self):
+        # amounts shares the weights' sparsity pattern, only its values are saved
+        amounts = self.amounts.data if self.amounts is not None else np.zeros(0)
+        np.savez_compressed(
+            self.path(self.date), data=self.weights.data, indices=self.weights.indices,
+            indptr=self.weights.indptr, shape=self.weights.shape, amounts=amounts,
+            etfs=np.array(self.etfs, dtype=str), stocks=np.array(self.stocks, dtype=str),
+            names=np.array([self.names.get(t, "") for t in self.etfs], dtype=str),
+            missing=np.array(self.missing, dtype=str)
+        )
+
+    @classmethod
+    def load(cls, date):
+        """
+        Returns the saved matrix of date, or None.
+        """
+        if not os.path.exists(cls.path(date)):
+            return None
+        with np.load(cls.path(date)) as f:
+            shape = tuple(f['shape'])
+            weights = sparse.csr_matrix((f['data'], f['indices'], f['indptr']), shape=shape)
+            amounts = None
+            if 'amounts' in f.files and len(f['amounts']) == len(f['data']):
+                amounts = sparse.csr_matrix((f['amounts'], f['indices'], f['indptr']), shape=shape)
+            etfs = f['etfs'].tolist()
+            names = {t: n for t, n in zip(etfs, f['names'].tolist()) if n} if 'names' in f.files else {}
+            missing = f['missing'].tolist() if 'missing' in f.files else []
+            return cls(etfs, f['stocks'].tolist(), weights, date, amounts, names, missing)
+
+    @staticmethod
+    def target_date(fetcher, date=None):
+        """
+        The last completed trading day on or before date (default: today).
+        """
+        yesterday = (sources.today() - timedelta(days=1)).strftime("%Y%m%d")
+        return fetcher.calendar.previous_trading_day(min(date or yesterday, yesterday))
+
+    @classmethod
+    def build(cls, fetcher, date=None, tickers=None):
+        """
+        Loads (or builds and saves) the matrix for the last completed trading
+        day on or before date. tickers defaults to every domestic equity ETF.
+        ETFs whose PDF failed are saved as missing and fetched again on the
+        next build, so a partial download is not kept for the whole day.
+        Building downloads the missing PDFs concurrently (do not call this from a pool job).
+        """
+        date = cls.target_date(fetcher, date)
+        whole_universe = tickers is None
+        cached = None
+        if whole_universe:
+            cached = cls.load(date)
+            if cached is not None and not cached.missing:
+                return cached
+        universe = fetcher.get_etf_universe(date)
+        names = universe['name'].to_dict()
+        if whole_universe:
+            domestic = universe[universe['category'] == "Domestic"]
+            # Only the ETFs a saved partial build is missing are fetched again
+            tickers = cached.missing if cached is not None else domestic.index.tolist()
+
+        with span("holdings_matrix") as s:
+            # PDFs come from the local PDF store, only a new trading day is downloaded.
+            # The universe only lists ETFs listed by date, so an empty PDF is a failure.
+            pdfs = fetcher.executor.map(lambda t: fetcher.get_etf_pdf(t, date, listed=True), tickers)
+            matrix = cls.from_pdfs(dict(zip(tickers, pdfs)), date, names)
+            if cached is not None:
+                matrix = cached.extend(matrix)
+            s.rows = len(matrix.etfs)
+        if matrix.missing:
+            print(f"Holdings matrix {date}: no PDF for {len(matrix.missing)} ETFs, retried on the next build")
+        if whole_universe and matrix.etfs:
+            matrix.save()
+        return matrix
+
+    # --- Queries ---
+
+    def __contains__(self, etf):
+        return etf in self._rows
+
+    def holders(self, stock):
+        """
+        ETFs holding stock, largest weight first: list of
+        (ETF ticker, name, weight (%), amount). Served from the column-major
+        copy of the matrix, so a lookup only touches that stock's entries.
+        """
+        j = self._columns.get(str(stock))
+        if j is None:
+            return []
+        start, end = self._by_stock.indptr[j], self._by_stock.indptr[j + 1]
+        rows = self._by_stock.indices[start:end]
+        weights = self._by_stock.data[start:end] * 100
+        if self._amounts_by_stock is not None:
+            amounts = self._amounts_by_stock.data[start:end]
+        else:
+            amounts = np.zeros(len(rows))
+        order = np.argsort(-weights, kind='stable')
+        return [
+            (self.etfs[rows[i]], self.names.get(self.etfs[rows[i]], ""), float(weights[i]), float(amounts[i]))
+            for i in order
+        ]
+
+    def row(self, etf):
+        """
+        Weights of one ETF (index=stock ticker).
+        """
+        r = self.weights.getrow(self._rows[etf])
+        return pd.Series(r.data, index=[self.stocks[j] for j in r.indices]).sort_values(ascending=False)
+
+    def _normalized_rows(self):
+        # Rows scaled to unit length, so a product of two rows is their cosine
+        if self._normalized is None:
+            norms = np.sqrt(np.asarray(self.weights.multiply(self.weights).sum(axis=1)).ravel())
+            scale = np.divide(1.0, norms, out=np.zeros_like(norms), where=norms > 0)
+            self._normalized = sparse.diags(scale) @ self.weights
+        return self._normalized
+
+    def cosine_all(self, etf):
+        """
+        Cosine similarity of etf's weight vector with every ETF (sparse mat-vec).
+        """
+        w = self._normalized_rows()
+        return pd.Series((w @ w.getrow(self._rows[etf]).T).toarray().ravel(), index=self.etfs)
+
+    def overlap_all(self, etf):
+        """
+        Weight overlap (%) of etf with every ETF: the sum over common stocks
+        of the smaller of the two weights. Only the columns of etf's own
+        holdings are touched.
+        """
+        target = self.weights.getrow(self._rows[etf])
+        sub = self.weights[:, target.indices].tocoo()
+        common = np.minimum(sub.data, target.data[sub.col])
+        overlap = np.bincount(sub.row, weights=common, minlength=len(self.etfs))
+        return pd.Series(overlap * 100, index=self.etfs)
+
+    def cosine(self, a, b):
+        return float(self.cosine_all(a)[b])
+
+    def overlap(self, a, b):
+        return float(self.overlap_all(a)[b])
+
+    def cosine_matrix(self):
+        """
+        Pairwise cosine similarity of every ETF (sparse ETF x ETF matrix).
+        """
+        w = self._normalized_rows()
+        return w @ w.T
+
+    def similar(self, etf, k=10):
+        """
+        The k ETFs most similar to etf by cosine similarity (itself excluded),
+        with their weight overlap (%). Returns a DataFrame (index=ETF ticker).
+        """
+        cosine = self.cosine_all(etf).drop(etf)
+        cosine = cosine[cosine > 0]
+        if len(cosine) > k:
+            top = np.argpartition(-cosine.to_numpy(), k)[:k]
+            cosine = cosine.iloc[top]
+        cosine = cosine.sort_values(ascending=False)
+        overlap = self.overlap_all(etf).reindex(cosine.index)
+        return pd.DataFrame({'cosine': cosine, 'overlap': overlap})
+
+_matrix = None
+_matrix_lock = threading.Lock()
+
+def get_holdings_matrix(fetcher=None, ticker=None):
+    """
+    Returns the process-wide whole-universe HoldingsMatrix of the last
+    completed trading day, rebuilt once the trading day moves on or while
+    some ETFs' PDFs are still missing. Concurrent callers wait for the same
+    build instead of starting their own.
+
+    ticker: an ETF the caller needs as a row. If the matrix has no row for
+    it (its PDF failed, or it is outside the domestic universe), only its PDF
+    is fetched and added to the shared matrix.
+    """
+    global _matrix
+    if fetcher is None:
+        from data.etf_data import ETFDataFetcher
+        fetcher = ETFDataFetcher()
+    with _matrix_lock:
+        date = HoldingsMatrix.target_date(fetcher)
+        if _matrix is None or _matrix.date != date or _matrix.missing:
+            # A partial build only fetches the ETFs it is missing
+            matrix = HoldingsMatrix.build(fetcher, date)
+            if not matrix.etfs:
+                # Nothing downloaded (offline), try again on the next call
+                return _matrix or matrix
+            _matrix = matrix
+        if ticker is not None and ticker not in _matrix:
+            row = HoldingsMatrix.build(fetcher, date, [ticker])
+            if row.etfs:
+                _matrix = _matrix.extend(row)
+                _matrix.save()
+        return _matrix
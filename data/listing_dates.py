@@ -0,0 +1,214 @@
+import datetime
+import pandas as pd
+from concurrent.futures import as_completed
+from data import sources
+from data.sources import stock, yf, etx
+from data.local_store import connect, db_lock
+from data.fetch_executor import get_executor
+
+# Earliest date we look at (KRX ETF market opened in Oct 2002)
+FIRST_ETF_DATE = datetime.date(2002, 1, 1)
+
+# Longest stretch without a trading day on KRX (Chuseok/Seollal + weekends)
+PROBE_WINDOW = datetime.timedelta(days=14)
+
+class ListingDateIndex:
+    """
+    Local ticker -> listing date (YYYY-MM-DD) index for the ETF universe.
+
+    Filled in bulk from KRX's ETF master listing (one request), topped up once
+    a day with newly listed tickers, and on a miss the candidate sources are
+    queried concurrently and the first valid answer is kept.
+    """
+    DB_NAME = "listing_dates.sqlite"
+
+    def __init__(self):
+        self.executor = get_executor()
+        with db_lock:
+            conn = connect(self.DB_NAME)
+            try:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS listing_dates ("
+                    "ticker TEXT PRIMARY KEY, date TEXT, source TEXT)"
+                )
+                conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+                conn.commit()
+            finally:
+                conn.close()
+
+    def get(self, ticker):
+        """
+        Returns the listing date of the ticker as YYYY-MM-DD, or None.
+        """
+        date = self._lookup(ticker)
+        if date:
+            return date
+
+        # Bulk fill (once a day) usually answers the miss without any per-ticker request
+        if self.refresh():
+            date = self._lookup(ticker)
+            if date:
+                return date
+
+        date, source = self._race(ticker)
+        if date:
+            self._save({ticker: date}, source)
+        return date
+
+    def refresh(self):
+        """
+        Adds listing dates of every ETF from KRX's master listing.
+        Runs at most once a day, returns True if new data was loaded.
+        """
+        today = sources.today().strftime("%Y%m%d")
+        if self._get_meta("filled_on") == today:
+            return False
+        try:
+            dates = self.executor.call(self._fetch_krx_listing_dates)
+        except Exception as e:
+            print(f"Error fetching KRX listing dates: {e}")
+            return False
+
+        self._save(dates.to_dict(), "krx", replace=False)
+        self._set_meta("filled_on", today)
+        return True
+
+    def _fetch_krx_listing_dates(self):
+        # pykrx keeps KRX's ETF master listing (including 상장일) in memory;
+        # it is the same table get_etf_ticker_list() downloads.
+        df = etx.EtxTicker().df
+        df = df[df['시장'] == 'ETF']
+        dates = pd.to_datetime(
+            df['상장일'].astype(str).str.replace(r"\D", "", regex=True), format="%Y%m%d", errors="coerce"
+        )
+        return dates.dropna().dt.strftime("%Y-%m-%d")
+
+    def _race(self, ticker):
+        """
+        Queries every candidate source concurrently and keeps the first valid answer.
+        """
+        candidates = []
+        if "." in ticker:
+            candidates.append(("yfinance", ticker))
+        else:
+            # KOSPI/KOSDAQ ETFs usually use .KS in Yahoo, .KQ just in case
+            candidates += [("yfinance", f"{ticker}.KS"), ("yfinance", f"{ticker}.KQ")]
+
+        futures = {}
+        for source, symbol in candidates:
+            futures[self.executor.submit(self._from_yf_info, symbol)] = source
+            futures[self.executor.submit(self._from_yf_metadata, symbol)] = source
+        if "." not in ticker:
+            futures[self.executor.submit(self._from_pykrx, ticker)] = "pykrx"
+
+        for future in as_completed(futures):
+            try:
+                date = future.result()
+            except Exception:
+                continue
+            if date:
+                # Drop whatever has not started yet; running requests just finish in the background
+                for other in futures:
+                    other.cancel()
+                return date, futures[future]
+        return None, None
+
+    def _from_yf_info(self, symbol):
+        # Most accurate "First Trade Date"
+        info = self.executor.call(lambda: yf.Ticker(symbol).info)
+        if 'firstTradeDateMilliseconds' in info:
+            ts_ms = info['firstTradeDateMilliseconds']
+            return datetime.datetime.fromtimestamp(ts_ms / 1000).strftime("%Y-%m-%d")
+        return None
+
+    def _from_yf_metadata(self, symbol):
+        # Often available when info is partial; this is usually a seconds timestamp
+        meta = self.executor.call(yf.Ticker(symbol).get_history_metadata)
+        if 'firstTradeDate' in meta:
+            return datetime.datetime.fromtimestamp(meta['firstTradeDate']).strftime("%Y-%m-%d")
+        return None
+
+    def _from_pykrx(self, ticker):
+        """
+        Finds the first trading day with a binary search over two-week windows
+        (~15 tiny requests) instead of downloading 20 years of bars.
+        """
+        def bars(start):
+            end = start + PROBE_WINDOW
+            return self.executor.call(
+                stock.get_etf_ohlcv_by_date, start.strftime("%Y%m%d"), end.strftime("%Y%m%d"), ticker
+            )
+
+        def no_bars(start):
+            # pykrx also returns an empty frame for a failed request, which would
+            # send the search past the real listing date: an empty window only
+            # counts after a second request agrees
+            return bars(start).empty and bars(start).empty
+
+        lo = FIRST_ETF_DATE
+        hi = sources.today() - PROBE_WINDOW
+        if bars(hi).empty:
+            # Not trading anymore (or unknown ticker)
+            return None
+
+        first = bars(lo)
+        if not first.empty:
+            return first.index[0].strftime("%Y-%m-%d")
+
+        # Invariant: no bars in lo's window, bars in hi's window
+        while (hi - lo) > PROBE_WINDOW:
+            mid = lo + (hi - lo) // 2
+            if no_bars(mid):
+                lo = mid
+            else:
+                hi = mid
+        first = bars(hi)
+        if first.empty:
+            return None
+
+        # A listed ETF trades in every window, so the answer must have no bars
+        # in the window before it; otherwise it is dropped instead of stored
+        listed = first.index[0].date()
+        if not no_bars(listed - PROBE_WINDOW - datetime.timedelta(days=1)):
+            return None
+        return listed.strftime("%Y-%m-%d")
+
+    def _lookup(self, ticker):
+        with db_lock:
+            conn = connect(self.DB_NAME)
+            try:
+                row = conn.execute("SELECT date FROM listing_dates WHERE ticker=?", (ticker,)).fetchone()
+            finally:
+                conn.close()
+        return row[0] if row else None
+
+    def _save(self, dates, source, replace=True):
+        verb = "INSERT OR REPLACE" if replace else "INSERT OR IGNORE"
+        with db_lock:
+            conn = connect(self.DB_NAME)
+            try:
+                conn.executemany(
+                    f"{verb} INTO listing_dates VALUES (?, ?, ?)",
+                    [(ticker, date, source) for ticker, date in dates.items()]
+                )
+                conn.commit()
+            finally:
+                conn.close()
+
+    def _get_meta(self, key):
+        with db_lock:
+            conn = connect(self.DB_NAME)
+            try:
+                row = conn.execute("SELECT value FROM meta WHERE key=?", (key,)).fetchone()
+            finally:
+                conn.close()
+        return row[0] if row else None
+
+    def _set_meta(self, key, value):
+        with db_lock:
+            conn = connect(self.DB_NAME)
+            try:
+                conn.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, value))
+                conn.commit()
+            finally:
+                conn.close()
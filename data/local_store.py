@@ -0,0 +1,30 @@
+import os
+import sqlite3
+import threading
+
+# Local cache directory (override with ETF_ANALYSIS_CACHE_DIR)
+CACHE_DIR = os.environ.get(
+    "ETF_ANALYSIS_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cache")
+)
+
+# SQLite connections are opened per call, but writes from worker threads
+# are serialized through this lock to avoid "database is locked" errors.
+db_lock = threading.RLock()
+
+def cache_path(filename):
+    """
+    Returns the absolute path of a file inside the cache directory.
+    """
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    return os.path.join(CACHE_DIR, filename)
+
+def connect(filename):
+    """
+    Opens a SQLite connection to a database file inside the cache directory.
+    """
+    return sqlite3.connect(cache_path(filename), timeout=30)
+
+def table_exists(conn, table):
+    cur = conn.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (table,))
+    return cur.fetchone() is not None
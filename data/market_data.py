@@ -1,10 +1,48 @@
-import yfinance as yf
-from pykrx import stock, bond
-from datetime import datetime, timedelta
+import pandas as pd
+from data import sources
+from data.sources import bond, yf
+from data.fetch_executor import get_executor
+from data.trading_calendar import get_calendar
+from data.tracing import span
 
 class MarketDataFetcher:
     def __init__(self):
-        pass
+        # Shared rate limiter / retry policy for every request
+        self.executor = get_executor()
+
+    def _fetch_index_closes(self, symbols):
+        """
+        Downloads the last few days of every index in one multi-symbol request.
+        Returns a DataFrame of closes (index=date, columns=symbols).
+        """
+        with span("index_closes") as s:
+            df = self.executor.call(
+                yf.download, symbols, period="5d", progress=False, auto_adjust=False
+            )
+            s.rows = len(df)
+        return df['Close']
+
+    def _fetch_bond_yields(self):
+        # Start from the latest trading day instead of probing weekends/holidays.
+        # The dashboard does not wait for the calendar's first download: until it
+        # is loaded the weekday rule is used, with one more try for a holiday.
+        calendar = get_calendar()
+        if calendar.is_loaded():
+            previous_day, attempts = calendar.previous_trading_day, 2
+        else:
+            previous_day, attempts = calendar.previous_weekday, 3
+        target_date = previous_day(sources.today().strftime("%Y%m%d"))
+        
+        # Today's yields may not be published yet, then the previous trading day is used
+        for _ in range(attempts):
+            try:
+                df = self.executor.call(bond.get_otc_treasury_yields, target_date)
+                if not df.empty:
+                    return df
+            except:
+                pass
+            target_date = previous_day(target_date, inclusive=False)
+        return None
         
     def get_market_indices(self):
         """
@@ -23,39 +61,37 @@ class MarketDataFetcher:
             "USD/KRW": "KRW=X"
         }
         
+        # Bond yields (pykrx) run concurrently with the single index download (yfinance),
+        # so latency is set by the slowest source rather than the sum
+        bond_future = self.executor.submit(self._fetch_bond_yields)
+        
+        closes = pd.DataFrame()
+        try:
+            closes = self._fetch_index_closes(list(tickers.values()))
+        except Exception as e:
+            print(f"Error fetching market indices: {e}")
+        
         for name, symbol in tickers.items():
-            try:
-                ticker = yf.Ticker(symbol)
-                # Get 2 days of history to calculate delta
-                hist = ticker.history(period="5d") # Fetch a bit more to be safe
-                if len(hist) >= 2:
-                    current = hist['Close'].iloc[-1]
-                    prev = hist['Close'].iloc[-2]
-                    delta = current - prev
-                    data[name] = (round(current, 2), round(delta, 2))
-                elif len(hist) == 1:
-                    current = hist['Close'].iloc[-1]
-                    data[name] = (round(current, 2), 0.0)
-                else:
-                    data[name] = ("N/A", 0.0)
-            except Exception as e:
-                print(f"Error fetching {name}: {e}")
+            if symbol not in closes.columns:
                 data[name] = ("Error", 0.0)
+                continue
+            # Each symbol has its own trading days (USD/KRW trades on KRX holidays)
+            hist = closes[symbol].dropna()
+            if len(hist) >= 2:
+                current = hist.iloc[-1]
+                prev = hist.iloc[-2]
+                delta = current - prev
+                data[name] = (round(current, 2), round(delta, 2))
+            elif len(hist) == 1:
+                current = hist.iloc[-1]
+                data[name] = (round(current, 2), 0.0)
+            else:
+                data[name] = ("N/A", 0.0)
                 
         # 2. Bond Yields
         # Fetch from pykrx
         try:
-            bond_df = None
-            # Try up to 7 days back to find valid data (holidays/weekends)
-            for i in range(7):
-                target_date = (datetime.now() - timedelta(days=i)).strftime("%Y%m%d")
-                try:
-                    df = bond.get_otc_treasury_yields(target_date)
-                    if not df.empty:
-                        bond_df = df
-                        break
-                except:
-                    continue
+            bond_df = bond_future.result()
             
             if bond_df is not None:
                 # Extract Gov Bond 3Y (국고채 3년)
@@ -82,30 +118,12 @@ class MarketDataFetcher:
             data["Gov Bond 3Y"] = ("Error", 0.0)
             data["Corp Bond AA-"] = ("Error", 0.0)
         
-        # Determine reference date (using KOSPI's last date if available, else today)
-        ref_date_str = datetime.now().strftime("%Y-%m-%d")
-        try:
-            # Try to get date from KOSPI history if available
-            # We need to re-fetch or store it from the loop above. 
-            # Let's just fetch KOSPI specifically for the date to be sure, or optimize.
-            # Optimization: We already fetched it in the loop. But we didn't save the hist object.
-            # Let's just fetch KOSPI one more time or just use today if it fails.
-            # Better: capture it in the loop.
-            pass
-        except:
-            pass
-            
-        # Actually, let's refine the loop to capture the date.
-        # But since I can't easily change the whole loop structure in one go without potential errors,
-        # I'll just do a quick check on KOSPI here.
-        try:
-            k_ticker = yf.Ticker("^KS11")
-            k_hist = k_ticker.history(period="5d")
-            if not k_hist.empty:
-                ref_date = k_hist.index[-1]
-                ref_date_str = ref_date.strftime("%Y-%m-%d")
-        except:
-            pass
+        # Reference date: KOSPI's last trading day from the data already in hand, else today
+        ref_date_str = sources.today().strftime("%Y-%m-%d")
+        if "^KS11" in closes.columns:
+            kospi = closes["^KS11"].dropna()
+            if not kospi.empty:
+                ref_date_str = kospi.index[-1].strftime("%Y-%m-%d")
 
         return data, ref_date_str
 
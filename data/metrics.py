@@ -0,0 +1,267 @@
+"""
+Vectorized performance metrics (no Qt, no I/O).
+
+Every function takes a date x ETF returns matrix and a benchmark return
+vector on the same dates, and computes the metric of every column in one
+NumPy pass. Missing values (NaN) are allowed: each column uses the dates
+where both it and the benchmark have a return, like an inner join.
+"""
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS = 252
+
+METRIC_COLUMNS = ['count', 'mean', 'volatility', 'sharpe', 'beta', 'treynor', 'correlation', 'excess_return']
+
+def daily_returns(prices):
+    """
+    Simple daily returns of a price Series/DataFrame (first date dropped).
+    """
+    return (prices / prices.shift(1) - 1).iloc[1:]
+
+def _safe_divide(a, b):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(b != 0, a / b, np.nan)
+
+def compute_metrics(returns, benchmark, total_returns=None, benchmark_total_return=None):
+    """
+    Computes risk / return metrics for every column of returns.
+
+    returns: DataFrame (index=date, columns=ETF) of daily returns
+    benchmark: Series of benchmark daily returns (aligned on returns.index)
+    total_returns: optional period returns (%) per column, for excess_return
+    benchmark_total_return: optional benchmark period return (%)
+
+    Returns a DataFrame (index=ETF) with count, mean (daily), volatility
+    (annualized), sharpe (risk-free rate 0, annualized), beta, treynor
+    (annualized mean / beta), correlation and excess_return (%).
+    Undefined values (too few dates, zero volatility / beta) are NaN.
+
+    This is one batch of RunningMoments, so the screener and the incremental
+    single-ETF analysis share the same formulas.
+    """
+    if isinstance(returns, pd.Series):
+        returns = returns.to_frame()
+    benchmark = pd.Series(benchmark).reindex(returns.index)
+
+    moments = RunningMoments()
+    moments.add(returns.to_numpy(dtype=float), benchmark.to_numpy(dtype=float))
+    result = pd.DataFrame(moments.table(), index=returns.columns)
+    result['excess_return'] = np.nan
+
+    if total_returns is not None and benchmark_total_return is not None:
+        total = pd.Series(total_returns).reindex(returns.columns).to_numpy(dtype=float)
+        result['excess_return'] = np.where(result['count'] > 0, total - benchmark_total_return, np.nan)
+    return result[METRIC_COLUMNS]
+
+def period_returns(prices):
+    """
+    Return (%) of every column from its first to its last valid price.
+    """
+    p = prices.to_numpy(dtype=float)
+    valid = ~np.isnan(p)
+    first = p[valid.argmax(axis=0), np.arange(p.shape[1])]
+    last = p[len(p) - 1 - valid[::-1].argmax(axis=0), np.arange(p.shape[1])]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result = np.where(valid.any(axis=0), (last / first - 1) * 100, np.nan)
+    return pd.Series(result, index=prices.columns)
+
+def max_drawdown(prices):
+    """
+    Largest peak-to-trough decline (%, negative) of every column.
+    NaN prices (before listing, suspended days) are skipped.
+    """
+    p = prices.to_numpy(dtype=float)
+    # fmax ignores NaN, so the running peak carries over gaps
+    peak = np.fmax.accumulate(p, axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        drawdown = p / peak - 1
+    valid = ~np.isnan(drawdown)
+    result = np.where(valid.any(axis=0), np.where(valid, drawdown, 0.0).min(axis=0) * 100, np.nan)
+    return pd.Series(result, index=prices.columns)
+
+def tracking_error(returns, reference):
+    """
+    Annualized standard deviation of returns - reference for every column.
+    reference is a matrix with the same shape (e.g. each ETF's underlying
+    index) or a single benchmark Series.
+    """
+    r = returns.to_numpy(dtype=float)
+    if isinstance(reference, pd.DataFrame):
+        ref = reference.reindex(index=returns.index, columns=returns.columns).to_numpy(dtype=float)
+    else:
+        ref = pd.Series(reference).reindex(returns.index).to_numpy(dtype=float)[:, None]
+    diff = r - ref
+    mask = ~np.isnan(diff)
+    count = mask.sum(axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = np.where(mask, diff, 0.0).sum(axis=0) / count
+        centered = np.where(mask, diff - mean, 0.0)
+        var = (centered * centered).sum(axis=0) / np.where(count > 1, count - 1, np.nan)
+    return pd.Series(np.sqrt(var) * np.sqrt(TRADING_DAYS), index=returns.columns)
+
+ROLLING_WINDOWS = [20, 60, 120, 252]
+
+ROLLING_COLUMNS = ['sharpe', 'volatility', 'beta', 'correlation']
+
+def _window_sums(values, window):
+    # Sum over every trailing window as a difference of two prefix sums: O(n)
+    prefix = np.cumsum(np.vstack([np.zeros((1, values.shape[1])), values]), axis=0)
+    return prefix[window:] - prefix[:-window]
+
+def rolling_metrics(returns, benchmark, window):
+    """
+    Rolling Sharpe, volatility (annualized), beta and correlation over the
+    trailing `window` dates, for every column of returns.
+
+    Each window is computed from prefix sums of x, y, x², y² and xy, so the
+    cost is O(n) per window size regardless of its length. A window needs a
+    return on all of its dates (both ETF and benchmark), otherwise it is NaN.
+
+    Returns a dict {metric: DataFrame (index=date, columns=ETF)}.
+    """
+    if isinstance(returns, pd.Series):
+        returns = returns.to_frame()
+    benchmark = pd.Series(benchmark).reindex(returns.index)
+    n, k = returns.shape
+    empty = {col: pd.DataFrame(np.nan, index=returns.index, columns=returns.columns) for col in ROLLING_COLUMNS}
+    if n < window or window < 2:
+        return empty
+
+    r = returns.to_numpy(dtype=float)
+    b = np.broadcast_to(benchmark.to_numpy(dtype=float)[:, None], r.shape)
+    mask = ~np.isnan(r) & ~np.isnan(b)
+    if not mask.any():
+        return empty
+
+    # Moments are shift invariant: centering on the full-sample mean keeps the
+    # prefix sums small and avoids cancellation on long histories
+    with np.errstate(invalid='ignore'):
+        shift_r = np.nanmean(np.where(mask, r, np.nan), axis=0)
+        shift_b = np.nanmean(np.where(mask, b, np.nan), axis=0)
+    x = np.where(mask, r - shift_r, 0.0)
+    y = np.where(mask, b - shift_b, 0.0)
+
+    count = _window_sums(mask.astype(float), window)
+    sx, sy = _window_sums(x, window), _window_sums(y, window)
+    sxx, syy, sxy = _window_sums(x * x, window), _window_sums(y * y, window), _window_sums(x * y, window)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        full = count == window
+        var_x = np.maximum((sxx - sx * sx / window) / (window - 1), 0.0)
+        var_y = np.maximum((syy - sy * sy / window) / (window - 1), 0.0)
+        cov = (sxy - sx * sy / window) / (window - 1)
+        mean_x = sx / window + shift_r
+        std_x = np.sqrt(var_x)
+
+        values = {
+            'sharpe': _safe_divide(mean_x, std_x) * np.sqrt(TRADING_DAYS),
+            'volatility': std_x * np.sqrt(TRADING_DAYS),
+            'beta': _safe_divide(cov, var_y),
+            'correlation': _safe_divide(cov, std_x * np.sqrt(var_y)),
+        }
+
+    # First window ends on date window-1
+    lead = np.full((window - 1, k), np.nan)
+    return {
+        col: pd.DataFrame(np.vstack([lead, np.where(full, v, np.nan)]), index=returns.index, columns=returns.columns)
+        for col, v in values.items()
+    }
+
+class RunningMoments:
+    """
+    Running sums of x, y, x², y² and xy over paired daily returns (ETF x,
+    benchmark y), kept per column of x, so the metrics of an analysis window
+    can be updated when dates enter or leave it instead of being recomputed.
+    compute_metrics is a single batch of it.
+
+    Values are shifted by each column's mean in the first batch added, which
+    keeps the sums small and avoids cancellation: for a single batch the sums
+    are exactly the centered (two-pass) moments.
+    """
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.count = None
+        self.shift = None
+        self.sums = None
+
+    def _terms(self, x, y):
+        # x: (dates,) or (dates, columns); y: (dates,), shared by every column
+        x = np.asarray(x, dtype=float)
+        if x.ndim == 1:
+            x = x[:, None]
+        y = np.asarray(y, dtype=float).reshape(-1, 1)
+        mask = ~np.isnan(x) & ~np.isnan(y)
+        n = mask.sum(axis=0)
+        if self.shift is None:
+            if not n.any():
+                return n, np.zeros((5, x.shape[1]))
+            with np.errstate(divide='ignore', invalid='ignore'):
+                self.shift = (
+                    np.where(n > 0, np.where(mask, x, 0.0).sum(axis=0) / n, 0.0),
+                    np.where(n > 0, np.where(mask, y, 0.0).sum(axis=0) / n, 0.0),
+                )
+        dx = np.where(mask, x - self.shift[0], 0.0)
+        dy = np.where(mask, y - self.shift[1], 0.0)
+        return n, np.array([dx.sum(axis=0), dy.sum(axis=0), (dx * dx).sum(axis=0),
+                            (dy * dy).sum(axis=0), (dx * dy).sum(axis=0)])
+
+    def add(self, x, y):
+        n, terms = self._terms(x, y)
+        if self.sums is None:
+            self.count, self.sums = n, terms
+        else:
+            self.count = self.count + n
+            self.sums = self.sums + terms
+
+    def remove(self, x, y):
+        if self.sums is None:
+            return
+        n, terms = self._terms(x, y)
+        self.count = self.count - n
+        self.sums = self.sums - terms
+        if (self.count <= 0).all():
+            # Nothing left, drop the accumulated rounding error too
+            self.clear()
+
+    def table(self):
+        """
+        Returns {count, mean, volatility, sharpe, beta, treynor, correlation},
+        each an array with one value per column (NaN when undefined).
+        """
+        if self.sums is None:
+            count, sums = np.zeros(1, dtype=int), np.zeros((5, 1))
+        else:
+            count, sums = self.count, self.sums
+        shift = self.shift if self.shift is not None else (0.0, 0.0)
+        n = count.astype(float)
+        sx, sy, sxx, syy, sxy = sums
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean_r = sx / n + shift[0]
+            dof = np.where(n > 1, n - 1, np.nan)
+            var_r = np.maximum((sxx - sx * sx / n) / dof, 0.0)
+            var_b = np.maximum((syy - sy * sy / n) / dof, 0.0)
+            cov = (sxy - sx * sy / n) / dof
+
+            std_r = np.sqrt(var_r)
+            beta = _safe_divide(cov, var_b)
+            return {
+                'count': count,
+                'mean': mean_r,
+                'volatility': std_r * np.sqrt(TRADING_DAYS),
+                'sharpe': _safe_divide(mean_r, std_r) * np.sqrt(TRADING_DAYS),
+                'beta': beta,
+                'treynor': _safe_divide(mean_r * TRADING_DAYS, beta),
+                'correlation': _safe_divide(cov, std_r * np.sqrt(var_b)),
+            }
+
+    def metrics(self):
+        """
+        Single-series form of table(): the first column's values as scalars.
+        """
+        return {
+            key: int(values[0]) if key == 'count' else float(values[0])
+            for key, values in self.table().items()
+        }
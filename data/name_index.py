@@ -0,0 +1,104 @@
+import threading
+import pandas as pd
+from data.sources import krx, etx
+from data.local_store import connect, db_lock
+from data.fetch_executor import get_executor
+
+class NameIndex:
+    """
+    Ticker -> name dictionary covering every KOSPI/KOSDAQ/KONEX stock and ETF.
+    Built in one bulk pass per trading day and persisted to the local cache,
+    so name resolution is a single Series.map instead of per-row lookups.
+    """
+    DB_NAME = "names.sqlite"
+
+    # Loaded indices shared by every instance (date -> Series)
+    _memory = {}
+    _memory_lock = threading.Lock()
+
+    def __init__(self):
+        self.executor = get_executor()
+        with db_lock:
+            conn = connect(self.DB_NAME)
+            try:
+                conn.execute("CREATE TABLE IF NOT EXISTS names (date TEXT, ticker TEXT, name TEXT)")
+                conn.execute("CREATE INDEX IF NOT EXISTS names_date ON names (date)")
+                conn.commit()
+            finally:
+                conn.close()
+
+    def get(self, date):
+        """
+        Returns the name index (Series indexed by ticker) for the given date (YYYYMMDD).
+        """
+        with self._memory_lock:
+            if date in self._memory:
+                return self._memory[date]
+
+        names = self._load(date)
+        if names.empty:
+            try:
+                names = self._build(date)
+                self._save(date, names)
+            except Exception as e:
+                print(f"Error building name index for {date}: {e}")
+        if names.empty:
+            # Offline or non-trading day: fall back to the latest stored index
+            names = self._load_latest()
+
+        if not names.empty:
+            with self._memory_lock:
+                self._memory[date] = names
+        return names
+
+    def map(self, tickers, date):
+        """
+        Resolves names for the given tickers in one vectorized lookup.
+        Unknown tickers keep the ticker itself as name.
+        """
+        tickers = pd.Series([str(t) for t in tickers])
+        names = tickers.map(self.get(date))
+        return names.fillna(tickers).tolist()
+
+    def _build(self, date):
+        # Two bulk listings: every stock with its name, and the ETF master listing
+        stocks = self.executor.call(krx.get_market_ticker_and_name, date, "ALL")
+        listing = self.executor.call(lambda: etx.EtxTicker().df)
+        etfs = listing.loc[listing['시장'] == 'ETF', '종목명']
+        names = pd.concat([stocks, etfs])
+        names = names[~names.index.duplicated()]
+        return names.rename("name").rename_axis("ticker")
+
+    def _load(self, date):
+        with db_lock:
+            conn = connect(self.DB_NAME)
+            try:
+                df = pd.read_sql("SELECT ticker, name FROM names WHERE date=?", conn, params=(date,))
+            finally:
+                conn.close()
+        return df.set_index("ticker")["name"]
+
+    def _load_latest(self):
+        with db_lock:
+            conn = connect(self.DB_NAME)
+            try:
+                row = conn.execute("SELECT MAX(date) FROM names").fetchone()
+            finally:
+                conn.close()
+        if row[0] is None:
+            return pd.Series(dtype=object)
+        return self._load(row[0])
+
+    def _save(self, date, names):
+        if names.empty:
+            return
+        rows = names.rename_axis("ticker").reset_index(name="name")
+        rows.insert(0, "date", date)
+        with db_lock:
+            conn = connect(self.DB_NAME)
+            try:
+                conn.execute("DELETE FROM names WHERE date=?", (date,))
+                rows.to_sql("names", conn, if_exists="append", index=False)
+                conn.commit()
+            finally:
+                conn.close()
@@ -0,0 +1,325 @@
+"""
+Local, delta-encoded history of ETF baskets (PDF, Portfolio Deposit File).
+
+An ETF's basket barely changes from one day to the next, so each stored
+day only keeps what changed since the previous stored day:
+
+- structure: rows of the non-value columns (e.g. 계약수) that were added
+  or changed, and the tickers that were removed. A full snapshot is stored
+  every FULL_EVERY days (and when a delta would not be smaller).
+- values: the price-driven columns (금액, 비중) move every day, so they are
+  stored as one array per column in ticker order, byte-shuffled and
+  compressed.
+
+A day is rebuilt from the nearest full snapshot plus the deltas after it,
+and a range scan applies the deltas day by day.
+"""
+import pickle
+import zlib
+import numpy as np
+import pandas as pd
+from data import sources
+from data.local_store import connect, db_lock
+
+DATE_FMT = "%Y%m%d"
+
+# Columns that follow market prices every day (stored as arrays, not deltas)
+VALUE_COLUMNS = ['금액', '비중']
+
+# At most this many deltas are applied to rebuild a day
+FULL_EVERY = 20
+
+def _pack(obj):
+    return zlib.compress(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
+
+def _unpack(blob):
+    return pickle.loads(zlib.decompress(blob))
+
+def _encode_values(values):
+    # Byte-shuffle: grouping the n-th byte of every number together
+    # makes similar magnitudes compress much better
+    encoded = {}
+    for col, arr in values.items():
+        raw = np.ascontiguousarray(arr).view(np.uint8).reshape(len(arr), arr.dtype.itemsize)
+        encoded[col] = (arr.dtype.str, raw.T.tobytes())
+    return _pack(encoded)
+
+def _decode_values(blob, length):
+    values = {}
+    for col, (dtype, raw) in _unpack(blob).items():
+        itemsize = np.dtype(dtype).itemsize
+        arr = np.frombuffer(raw, dtype=np.uint8).reshape(itemsize, length).T.copy()
+        values[col] = arr.view(dtype).ravel()
+    return values
+
+def _changed_rows(current, previous):
+    common = current.index.intersection(previous.index)
+    a, b = current.loc[common], previous.loc[common, current.columns]
+    differs = ~((a == b) | (a.isna() & b.isna())).all(axis=1)
+    added = current.index.difference(previous.index, sort=False)
+    return current.loc[common[differs.to_numpy()].append(added)]
+
+def _apply_delta(structure, record):
+    # Removed rows are dropped, changed rows updated, new rows added;
+    # rows stay sorted by ticker so the value arrays line up however a day was encoded
+    structure = structure.drop(record['removed']) if record['removed'] else structure.copy()
+    changed = record['changed']
+    existing = changed.index.isin(structure.index)
+    if existing.any():
+        structure.loc[changed.index[existing]] = changed[existing]
+    if (~existing).any():
+        structure = pd.concat([structure, changed[~existing]]).sort_index()
+    return structure
+
+class PDFStore:
+    """
+    Per-ETF daily basket archive in SQLite (one row per ETF and date).
+    Today's basket is never stored since it may still be republished.
+    """
+    DB_NAME = "pdf_store.sqlite"
+
+    def __init__(self, db_name=DB_NAME):
+        self.db_name = db_name
+        with db_lock:
+            conn = connect(self.db_name)
+            try:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS baskets ("
+                    "etf TEXT, date TEXT, full INTEGER, chain INTEGER, layout BLOB, "
+                    "structure BLOB, vals BLOB, PRIMARY KEY (etf, date))"
+                )
+                conn.commit()
+            finally:
+                conn.close()
+
+    # --- Reads ---
+
+    def dates(self, etf, start_date=None, end_date=None):
+        """
+        Stored dates (YYYYMMDD) of the ETF, optionally within [start_date, end_date].
+        """
+        with db_lock:
+            conn = connect(self.db_name)
+            try:
+                rows = conn.execute(
+                    "SELECT date FROM baskets WHERE etf=? AND date BETWEEN ? AND ? ORDER BY date",
+                    (etf, start_date or "00000000", end_date or "99999999")
+                ).fetchall()
+            finally:
+                conn.close()
+        return [r[0] for r in rows]
+
+    def load(self, etf, date):
+        """
+        Rebuilds the stored basket of one date (index=티커), or an empty
+        DataFrame if the date is not stored.
+        """
+        with db_lock:
+            conn = connect(self.db_name)
+            try:
+                return self._load(conn, etf, date)
+            finally:
+                conn.close()
+
+    def scan(self, etf, start_date, end_date):
+        """
+        Returns {date: basket} for every stored date in [start_date, end_date],
+        applying the deltas day by day.
+        """
+        with db_lock:
+            conn = connect(self.db_name)
+            try:
+                rows = conn.execute(
+                    "SELECT date, full, layout, structure, vals FROM baskets "
+                    "WHERE etf=? AND date BETWEEN ? AND ? ORDER BY date",
+                    (etf, start_date, end_date)
+                ).fetchall()
+                if not rows:
+                    return {}
+                # The first day may be a delta, rebuild its base first
+                structure = self._structure(conn, etf, rows[0][0], include_last=False)
+            finally:
+                conn.close()
+
+        baskets = {}
+        for date, full, layout, blob, vals in rows:
+            structure = self._apply(structure, full, blob)
+            baskets[date] = self._assemble(structure, layout, vals)
+        return baskets
+
+    def _load(self, conn, etf, date):
+        row = conn.execute(
+            "SELECT layout, vals FROM baskets WHERE etf=? AND date=?", (etf, date)
+        ).fetchone()
+        if row is None:
+            return pd.DataFrame()
+        structure = self._structure(conn, etf, date)
+        return self._assemble(structure, row[0], row[1])
+
+    def _structure(self, conn, etf, date, include_last=True):
+        # Structure columns of `date` (or of the day before it): the last full
+        # snapshot up to that date plus the deltas after it, O(changes)
+        op = "<=" if include_last else "<"
+        base = conn.execute(
+            f"SELECT MAX(date) FROM baskets WHERE etf=? AND full=1 AND date {op} ?", (etf, date)
+        ).fetchone()[0]
+        if base is None:
+            return None
+        rows = conn.execute(
+            f"SELECT full, structure FROM baskets WHERE etf=? AND date >= ? AND date {op} ? ORDER BY date",
+            (etf, base, date)
+        ).fetchall()
+        structure = None
+        for full, blob in rows:
+            structure = self._apply(structure, full, blob)
+        return structure
+
+    @staticmethod
+    def _apply(structure, full, blob):
+        record = _unpack(blob)
+        return record if full else _apply_delta(structure, record)
+
+    @staticmethod
+    def _assemble(structure, layout, vals):
+        columns, index_name = _unpack(layout)
+        basket = structure.copy()
+        for col, arr in _decode_values(vals, len(basket)).items():
+            basket[col] = arr
+        basket = basket[columns]
+        basket.index.name = index_name
+        return basket
+
+    # --- Writes ---
+
+    def get(self, etf, date, fetch_func):
+        """
+        Returns the basket of date, calling fetch_func(date) only if it is not stored.
+        """
+        basket = self.load(etf, date)
+        if basket.empty:
+            basket = fetch_func(date)
+            self.store(etf, {date: basket})
+        return basket
+
+    def backfill(self, etf, dates, fetch_many):
+        """
+        Stores every date not stored yet: fetch_many(missing_dates) returns
+        the baskets in the same order (e.g. fetched concurrently), and they are
+        written in one transaction.
+        """
+        stored = set(self.dates(etf))
+        missing = sorted(d for d in set(dates) if d not in stored)
+        if missing:
+            self.store(etf, dict(zip(missing, fetch_many(missing))))
+        return missing
+
+    def store(self, etf, baskets):
+        """
+        Stores {date: basket}. Empty baskets (holidays, failed requests) and
+        today's basket are skipped.
+        """
+        today = sources.today().strftime(DATE_FMT)
+        with db_lock:
+            conn = connect(self.db_name)
+            try:
+                last = None
+                for date in sorted(baskets):
+                    basket = baskets[date]
+                    if basket is None or basket.empty or date >= today:
+                        continue
+                    last = self._write(conn, etf, date, basket, last)
+                conn.commit()
+            finally:
+                conn.close()
+
+    def _write(self, conn, etf, date, basket, last=None):
+        """
+        Writes one day as a delta against the previous stored day (last is the
+        (date, structure, chain) of the previous write in the same batch, to skip
+        rebuilding it). Returns this day's (date, structure, chain).
+        """
+        previous = conn.execute(
+            "SELECT MAX(date) FROM baskets WHERE etf=? AND date < ?", (etf, date)
+        ).fetchone()[0]
+        following = conn.execute(
+            "SELECT date, full FROM baskets WHERE etf=? AND date > ? ORDER BY date LIMIT 1", (etf, date)
+        ).fetchone()
+        # A delta on the next stored day is against its previous day, which becomes
+        # this one; a full snapshot there does not depend on it
+        following_basket = None
+        if following and not following[1]:
+            following_basket = self._load(conn, etf, following[0])
+
+        prev_structure, chain = None, 0
+        if previous and last is not None and last[0] == previous:
+            _, prev_structure, chain = last
+        elif previous:
+            prev_structure = self._structure(conn, etf, previous)
+            chain = conn.execute(
+                "SELECT chain FROM baskets WHERE etf=? AND date=?", (etf, previous)
+            ).fetchone()[0]
+
+        structure, chain = self._insert(conn, etf, date, basket, prev_structure, chain + 1)
+        if following_basket is not None:
+            next_structure, next_chain = self._insert(
+                conn, etf, following[0], following_basket, structure, chain + 1
+            )
+            self._rechain(conn, etf, following[0], next_structure, next_chain)
+        return date, structure, chain
+
+    def _rechain(self, conn, etf, date, structure, chain):
+        """
+        Updates the chain counters of the deltas after date (up to the next full
+        snapshot) once date's chain changed, so no day needs more than
+        FULL_EVERY deltas; a day reaching it is rewritten as a full snapshot.
+        """
+        next_full = conn.execute(
+            "SELECT MIN(date) FROM baskets WHERE etf=? AND full=1 AND date > ?", (etf, date)
+        ).fetchone()[0]
+        rows = conn.execute(
+            "SELECT date, chain, structure FROM baskets WHERE etf=? AND date > ? AND date < ? ORDER BY date",
+            (etf, date, next_full or "99999999")
+        ).fetchall()
+        for day, stored_chain, blob in rows:
+            chain += 1
+            if chain < FULL_EVERY and chain == stored_chain:
+                # The rest of the run was already counted from here
+                break
+            structure = _apply_delta(structure, _unpack(blob))
+            if chain >= FULL_EVERY:
+                conn.execute(
+                    "UPDATE baskets SET full=1, chain=0, structure=? WHERE etf=? AND date=?",
+                    (_pack(structure), etf, day)
+                )
+                chain = 0
+            else:
+                conn.execute("UPDATE baskets SET chain=? WHERE etf=? AND date=?", (chain, etf, day))
+
+    def _insert(self, conn, etf, date, basket, prev_structure, chain):
+        value_cols = [c for c in VALUE_COLUMNS if c in basket.columns and pd.api.types.is_numeric_dtype(basket[c])]
+        if basket.index.is_unique:
+            basket = basket.sort_index()
+        structure = basket.drop(columns=value_cols)
+
+        full = (
+            prev_structure is None or chain >= FULL_EVERY
+            or not structure.index.is_unique or not prev_structure.index.is_unique
+            or list(structure.columns) != list(prev_structure.columns)
+        )
+        if not full:
+            changed = _changed_rows(structure, prev_structure)
+            removed = prev_structure.index.difference(structure.index, sort=False)
+            full = len(changed) + len(removed) >= len(structure)
+
+        if full:
+            record, chain = structure, 0
+        else:
+            record = {'removed': list(removed), 'changed': changed}
+
+        values = {col: basket[col].to_numpy() for col in value_cols}
+        conn.execute(
+            "INSERT OR REPLACE INTO baskets VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (etf, date, int(full), chain, _pack((list(basket.columns), basket.index.name)),
+             _pack(record), _encode_values(values))
+        )
+        return structure, chain
@@ -0,0 +1,176 @@
+import re
+import pandas as pd
+from datetime import datetime, timedelta
+from data import sources
+from data.local_store import connect, db_lock, table_exists
+
+DATE_FMT = "%Y%m%d"
+
+def _to_date(value):
+    return datetime.strptime(value, DATE_FMT).date()
+
+def _to_str(value):
+    return value.strftime(DATE_FMT)
+
+def missing_ranges(start_date, end_date, covered):
+    """
+    Returns the sub-ranges of [start_date, end_date] not covered by any of
+    the given (start, end) ranges. All dates are YYYYMMDD strings.
+    """
+    start = _to_date(start_date)
+    end = _to_date(end_date)
+    gaps = []
+    cursor = start
+    for c_start, c_end in sorted((_to_date(s), _to_date(e)) for s, e in covered):
+        if c_end < cursor:
+            continue
+        if c_start > end:
+            break
+        if c_start > cursor:
+            gaps.append((_to_str(cursor), _to_str(c_start - timedelta(days=1))))
+        cursor = max(cursor, c_end + timedelta(days=1))
+        if cursor > end:
+            break
+    if cursor <= end:
+        gaps.append((_to_str(cursor), _to_str(end)))
+    return gaps
+
+class PriceCache:
+    """
+    Local OHLCV store (one SQLite table per kind/ticker).
+    Remembers which date ranges were already requested, so only the missing
+    gaps are fetched from the source and merged in.
+    """
+    DB_NAME = "prices.sqlite"
+
+    def __init__(self, db_name=DB_NAME):
+        self.db_name = db_name
+        with db_lock:
+            conn = connect(self.db_name)
+            try:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS coverage ("
+                    "kind TEXT, ticker TEXT, start TEXT, end TEXT)"
+                )
+                conn.commit()
+            finally:
+                conn.close()
+
+    @staticmethod
+    def _table_name(kind, ticker):
+        return f"{kind}_{re.sub(r'[^0-9A-Za-z]', '_', str(ticker))}"
+
+    def get(self, kind, ticker, start_date, end_date, fetch_func):
+        """
+        Returns OHLCV rows for [start_date, end_date], calling
+        fetch_func(gap_start, gap_end) only for ranges not cached yet.
+        """
+        for gap_start, gap_end in self.missing(kind, ticker, start_date, end_date):
+            df = fetch_func(gap_start, gap_end)
+            self.store(kind, ticker, gap_start, gap_end, df)
+        return self.load(kind, ticker, start_date, end_date)
+
+    def missing(self, kind, ticker, start_date, end_date):
+        with db_lock:
+            conn = connect(self.db_name)
+            try:
+                covered = conn.execute(
+                    "SELECT start, end FROM coverage WHERE kind=? AND ticker=?", (kind, str(ticker))
+                ).fetchall()
+            finally:
+                conn.close()
+        return missing_ranges(start_date, end_date, covered)
+
+    def store(self, kind, ticker, start_date, end_date, df):
+        """
+        Replaces the rows of [start_date, end_date] with df and marks the range as covered.
+        Today's (and future) dates are never marked as covered since the bar may still change.
+        """
+        if df is None or df.empty:
+            # Failed requests come back empty too, so do not remember the gap
+            # (a range without any trading day is simply requested again)
+            return
+        table = self._table_name(kind, ticker)
+        yesterday = _to_str(sources.today() - timedelta(days=1))
+        covered_end = min(end_date, yesterday)
+
+        with db_lock:
+            conn = connect(self.db_name)
+            try:
+                if table_exists(conn, table):
+                    conn.execute(f'DELETE FROM "{table}" WHERE date BETWEEN ? AND ?', (start_date, end_date))
+                rows = df.copy()
+                rows.index = pd.to_datetime(rows.index).strftime(DATE_FMT)
+                rows.index.name = "date"
+                rows.to_sql(table, conn, if_exists="append")
+
+                if start_date <= covered_end:
+                    self._add_coverage(conn, kind, str(ticker), start_date, covered_end)
+                conn.commit()
+            finally:
+                conn.close()
+
+    def _add_coverage(self, conn, kind, ticker, start_date, end_date):
+        # Merge with overlapping/adjacent ranges so the coverage table stays small
+        rows = conn.execute(
+            "SELECT start, end FROM coverage WHERE kind=? AND ticker=?", (kind, ticker)
+        ).fetchall()
+        new_start, new_end = _to_date(start_date), _to_date(end_date)
+        for c_start, c_end in rows:
+            s, e = _to_date(c_start), _to_date(c_end)
+            if s <= new_end + timedelta(days=1) and e >= new_start - timedelta(days=1):
+                new_start, new_end = min(new_start, s), max(new_end, e)
+                conn.execute(
+                    "DELETE FROM coverage WHERE kind=? AND ticker=? AND start=? AND end=?",
+                    (kind, ticker, c_start, c_end)
+                )
+        conn.execute(
+            "INSERT INTO coverage VALUES (?, ?, ?, ?)",
+            (kind, ticker, _to_str(new_start), _to_str(new_end))
+        )
+
+    def load(self, kind, ticker, start_date, end_date):
+        table = self._table_name(kind, ticker)
+        with db_lock:
+            conn = connect(self.db_name)
+            try:
+                if not table_exists(conn, table):
+                    return pd.DataFrame()
+                df = pd.read_sql(
+                    f'SELECT * FROM "{table}" WHERE date BETWEEN ? AND ? ORDER BY date',
+                    conn, params=(start_date, end_date)
+                )
+            finally:
+                conn.close()
+
+        df.index = pd.to_datetime(df.pop("date"), format=DATE_FMT)
+        df.index.name = "날짜"
+        return df
+
+    def get_snapshot(self, kind, date, fetch_func):
+        """
+        Returns a whole-market by-ticker snapshot for a single date.
+        Past dates are cached, today's snapshot is always refetched.
+        """
+        table = f"snapshot_{kind}_{date}"
+        with db_lock:
+            conn = connect(self.db_name)
+            try:
+                if table_exists(conn, table):
+                    df = pd.read_sql(f'SELECT * FROM "{table}"', conn, index_col="티커")
+                    return df
+            finally:
+                conn.close()
+
+        df = fetch_func(date)
+        if df is not None and not df.empty and date < sources.today().strftime(DATE_FMT):
+            with db_lock:
+                conn = connect(self.db_name)
+                try:
+                    rows = df.copy()
+                    rows.index.name = "티커"
+                    rows.to_sql(table, conn, if_exists="replace")
+                    conn.commit()
+                finally:
+                    conn.close()
+        return df
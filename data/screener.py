@@ -0,0 +1,112 @@
+import pandas as pd
+from data.sources import stock
+from data.etf_data import ETFDataFetcher
+from data.metrics import (daily_returns, compute_metrics, period_returns,
+                          max_drawdown, tracking_error)
+from data.tracing import span
+
+SCREEN_COLUMNS = [
+    'name', 'total_return', 'excess_return', 'sharpe', 'treynor', 'beta',
+    'volatility', 'max_drawdown', 'tracking_error', 'count',
+]
+
+class ETFScreener:
+    """
+    Computes the analysis metrics for every target (domestic equity) ETF at once.
+
+    Prices come from whole-market by-date ETF snapshots (one request per
+    trading day instead of one per ETF), cached locally, and are pivoted into
+    dense date x ETF matrices so every metric is one vectorized pass.
+    """
+    def __init__(self, etf_fetcher=None):
+        self.fetcher = etf_fetcher or ETFDataFetcher()
+        self.executor = self.fetcher.executor
+        self.calendar = self.fetcher.calendar
+        self.price_cache = self.fetcher.price_cache
+
+    def get_etf_snapshot(self, date):
+        """
+        OHLCV / NAV / 기초지수 of every ETF on one trading day (index=티커).
+        """
+        try:
+            # A past trading day's snapshot is never empty, only today's may not be published yet
+            call = self.executor.call_nonempty if self.fetcher.has_completed_trading_day(date, date) else self.executor.call
+            return self.price_cache.get_snapshot(
+                "etf", date, lambda d: call(stock.get_etf_ohlcv_by_ticker, d)
+            )
+        except Exception as e:
+            print(f"Error fetching ETF snapshot for {date}: {e}")
+            return pd.DataFrame()
+
+    def price_matrices(self, start_date, end_date, columns=('NAV', '종가', '기초지수')):
+        """
+        Returns {column: DataFrame (index=date, columns=ticker)} for every trading
+        day in [start_date, end_date]. Snapshots are fetched concurrently.
+        """
+        days = self.calendar.trading_days_between(start_date, end_date)
+        with span("snapshots") as s:
+            snapshots = self.executor.map(self.get_etf_snapshot, days)
+            frames = {
+                pd.Timestamp(day): snap for day, snap in zip(days, snapshots) if not snap.empty
+            }
+            s.rows = len(frames)
+        if not frames:
+            return {col: pd.DataFrame() for col in columns}
+
+        stacked = pd.concat(frames, names=['날짜', '티커'])
+        matrices = {}
+        for col in columns:
+            if col in stacked.columns:
+                matrix = stacked[col].astype(float).unstack('티커')
+                # KRX reports 0 for missing NAV / index values
+                matrices[col] = matrix.where(matrix != 0)
+            else:
+                matrices[col] = pd.DataFrame(float("nan"), index=sorted(frames), columns=stacked.index.levels[1])
+        return matrices
+
+    def screen(self, start_date, end_date, tickers=None):
+        """
+        Returns one row per target ETF (index=ticker) with SCREEN_COLUMNS,
+        sorted by Sharpe ratio. tickers defaults to every domestic equity ETF.
+        """
+        start, end = self.calendar.snap_range(start_date, end_date)
+        if start is None:
+            return pd.DataFrame(columns=SCREEN_COLUMNS)
+
+        universe = self.fetcher.get_etf_universe(end)
+        if tickers is None:
+            tickers = universe.index[universe['category'] == "Domestic"]
+        tickers = [str(t) for t in tickers]
+
+        matrices = self.price_matrices(start, end)
+        closes = matrices['종가'].reindex(columns=tickers)
+        navs = matrices['NAV'].reindex(columns=tickers)
+        index_levels = matrices['기초지수'].reindex(columns=tickers)
+        if closes.empty:
+            return pd.DataFrame(columns=SCREEN_COLUMNS)
+
+        bm_df = self.fetcher.get_benchmark_data(start, end)
+
+        with span("metrics") as s:
+            s.rows = closes.shape[1]
+            # Same conventions as the single-ETF analysis: period return from NAV,
+            # daily returns from 종가
+            total_returns = period_returns(navs.fillna(closes))
+            returns = daily_returns(closes)
+
+            if bm_df.empty:
+                benchmark = pd.Series(float("nan"), index=returns.index)
+                bm_total_return = None
+            else:
+                benchmark = daily_returns(bm_df['종가'])
+                bm_total_return = (bm_df['종가'].iloc[-1] / bm_df['종가'].iloc[0] - 1) * 100
+
+            result = compute_metrics(returns, benchmark, total_returns, bm_total_return)
+            result['total_return'] = total_returns
+            result['max_drawdown'] = max_drawdown(navs.fillna(closes))
+            # Tracking error against each ETF's own underlying index
+            result['tracking_error'] = tracking_error(returns, daily_returns(index_levels))
+            result['name'] = universe['name'].reindex(result.index)
+
+        result.index.name = 'ticker'
+        return result[SCREEN_COLUMNS].sort_values('sharpe', ascending=False)
@@ -0,0 +1,215 @@
+"""
+Data source layer: every pykrx / yfinance access goes through the proxies
+defined here (stock, bond, yf, etx, krx) instead of the libraries themselves.
+
+Modes (ETF_DATA_SOURCE_MODE):
+- live   (default) requests go straight to pykrx / yfinance.
+- record requests go to pykrx / yfinance and every response is written to
+         a gzip-compressed fixture in ETF_FIXTURE_DIR.
+- replay responses are served from the fixtures only (no network), with an
+         optional simulated latency per request (ETF_REPLAY_LATENCY, seconds).
+
+Record and replay runs should start from the same (e.g. empty) local cache
+directory (ETF_ANALYSIS_CACHE_DIR), otherwise the replay asks for data the
+recording never requested. today() is frozen to the recording date in replay.
+"""
+import datetime
+import gzip
+import hashlib
+import importlib
+import json
+import os
+import pickle
+import threading
+import time
+import numpy as np
+import pandas as pd
+from data import tracing
+
+MODE = os.environ.get("ETF_DATA_SOURCE_MODE", "live").lower()
+
+FIXTURE_DIR = os.environ.get(
+    "ETF_FIXTURE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fixtures")
+)
+
+REPLAY_LATENCY = float(os.environ.get("ETF_REPLAY_LATENCY", 0))
+
+MANIFEST = "manifest.json"
+
+# Values stored as-is in fixtures; anything else (yf.Ticker, FundsData, ...)
+# is replaced by a child proxy so its own attributes are recorded one by one.
+LEAF_TYPES = (
+    pd.DataFrame, pd.Series, pd.Index, np.ndarray, np.generic,
+    dict, list, tuple, set, str, bytes, int, float, bool,
+    datetime.date, datetime.timedelta,
+)
+
+class MissingFixtureError(LookupError):
+    """
+    Raised in replay mode for a request that was never recorded.
+    """
+
+class _NonLeaf:
+    # Fixture marker for a result that is an object with its own attributes
+    pass
+
+_NON_LEAF = _NonLeaf()
+
+_stats = {"requests": 0}
+_stats_lock = threading.Lock()
+_manifest_lock = threading.Lock()
+_replay_date = {}
+
+def request_count():
+    """
+    Number of requests served so far (network or fixtures) in this process.
+    """
+    return _stats["requests"]
+
+def today():
+    """
+    Today's date; the recording date of the fixtures in replay mode.
+    """
+    if MODE == "replay":
+        if "recorded_on" not in _replay_date:
+            _replay_date["recorded_on"] = _read_manifest().get("recorded_on")
+        if _replay_date["recorded_on"]:
+            return datetime.datetime.strptime(_replay_date["recorded_on"], "%Y%m%d").date()
+    return datetime.date.today()
+
+def _read_manifest():
+    path = os.path.join(FIXTURE_DIR, MANIFEST)
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def _count():
+    with _stats_lock:
+        _stats["requests"] += 1
+    tracing.record_request()
+
+def _is_leaf(value):
+    return value is None or isinstance(value, LEAF_TYPES)
+
+def _fixture_path(key):
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+    return os.path.join(FIXTURE_DIR, digest[:2], digest + ".pkl.gz")
+
+def _call_key(path, args, kwargs):
+    return f"{path}({', '.join([repr(a) for a in args] + [f'{k}={v!r}' for k, v in sorted(kwargs.items())])})"
+
+def _save_fixture(key, outcome):
+    path = _fixture_path(key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    try:
+        data = pickle.dumps({"key": key, "outcome": outcome})
+    except Exception:
+        # Some library exceptions carry unpicklable state; keep type name and message
+        kind, value = outcome
+        data = pickle.dumps({"key": key, "outcome": (kind, RuntimeError(f"{type(value).__name__}: {value}"))})
+    # Write then rename, so concurrent identical requests never leave a torn file
+    tmp = f"{path}.{threading.get_ident()}.tmp"
+    with gzip.open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+    with _manifest_lock:
+        if not os.path.exists(os.path.join(FIXTURE_DIR, MANIFEST)):
+            with open(os.path.join(FIXTURE_DIR, MANIFEST), "w", encoding="utf-8") as f:
+                json.dump({"recorded_on": datetime.date.today().strftime("%Y%m%d")}, f)
+
+def _load_fixture(key):
+    path = _fixture_path(key)
+    if not os.path.exists(path):
+        return None
+    with gzip.open(path, "rb") as f:
+        return pickle.load(f)["outcome"]
+
+class SourceProxy:
+    """
+    Stand-in for a module or object of a data library.
+    Attribute reads and calls are forwarded (live/record) or served from
+    fixtures (replay), keyed by their access path, e.g.
+    "yfinance.Ticker('SPY').funds_data.top_holdings".
+    """
+    def __init__(self, path, target=None, loader=None):
+        self._path = path
+        self._target = target
+        self._loader = loader
+
+    def __repr__(self):
+        return f"<SourceProxy {self._path}>"
+
+    def _resolve(self):
+        if self._target is None and self._loader is not None:
+            self._target = self._loader()
+        return self._target
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        key = f"{self._path}.{name}"
+
+        if MODE == "replay":
+            outcome = _load_fixture(key)
+            if outcome is None:
+                # Never stored as a value: a method, resolved when called
+                return SourceProxy(key)
+            return self._unwrap(key, outcome)
+
+        value = getattr(self._resolve(), name)
+        if callable(value) and not isinstance(value, LEAF_TYPES):
+            return SourceProxy(key, value)
+        # Plain attribute / property (e.g. Ticker.info): this is a request
+        return self._wrap(key, value)
+
+    def __call__(self, *args, **kwargs):
+        key = _call_key(self._path, args, kwargs)
+
+        if MODE == "replay":
+            outcome = _load_fixture(key)
+            if outcome is None:
+                raise MissingFixtureError(f"No recorded response for {key}")
+            return self._unwrap(key, outcome)
+
+        try:
+            value = self._resolve()(*args, **kwargs)
+        except Exception as e:
+            _count()
+            if MODE == "record":
+                _save_fixture(key, ("error", e))
+            raise
+        return self._wrap(key, value)
+
+    def _wrap(self, key, value):
+        if _is_leaf(value):
+            _count()
+            if MODE == "record":
+                _save_fixture(key, ("value", value))
+            return value
+        if MODE == "record":
+            _save_fixture(key, ("value", _NON_LEAF))
+        return SourceProxy(key, value)
+
+    def _unwrap(self, key, outcome):
+        kind, value = outcome
+        if isinstance(value, _NonLeaf):
+            return SourceProxy(key)
+        _count()
+        if REPLAY_LATENCY:
+            time.sleep(REPLAY_LATENCY)
+        if kind == "error":
+            raise value
+        return value
+
+def _module(name):
+    return SourceProxy(name, loader=lambda: importlib.import_module(name))
+
+stock = _module("pykrx.stock")
+bond = _module("pykrx.bond")
+yf = _module("yfinance")
+# pykrx's ETF master listing (Ticker list with 상장일, 시장, ...)
+etx = _module("pykrx.website.krx.etx.ticker")
+# pykrx's KRX endpoints behind pykrx.stock (bulk listings, e.g. ticker -> name)
+krx = _module("pykrx.website.krx")
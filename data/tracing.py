@@ -0,0 +1,156 @@
+"""
+Lightweight tracing: a trace is a tree of named spans, each recording its
+duration, the number of data requests made inside it and the rows it handled.
+
+    with trace("analysis") as tr:
+        with span("pdf") as s:
+            pdf = ...
+            s.rows = len(pdf)
+    tr.summary()
+
+Open spans live in a context variable; FetchExecutor.submit() copies the
+context into pool jobs, so requests made on the pool are counted by the
+spans that were open when the job was submitted. Outside of a trace, span()
+records nothing.
+
+Set ETF_TRACE_DIR to also write every finished trace as a Chrome trace
+(chrome://tracing, Perfetto) JSON file.
+"""
+import contextvars
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+TRACE_DIR = os.environ.get("ETF_TRACE_DIR")
+
+_current_trace = contextvars.ContextVar("current_trace", default=None)
+_open_spans = contextvars.ContextVar("open_spans", default=())
+_lock = threading.Lock()
+
+class Span:
+    def __init__(self, name, depth):
+        self.name = name
+        self.depth = depth
+        self.start = time.perf_counter()
+        self.duration = None
+        self.requests = 0
+        self.rows = 0
+        self.thread_id = threading.get_ident()
+
+class Trace:
+    def __init__(self, name):
+        self.name = name
+        self.start = time.perf_counter()
+        self.spans = []
+
+    def summary(self):
+        """
+        Finished spans in start order, as dicts:
+        stage, depth (0 = whole trace), seconds, requests, rows.
+        """
+        with _lock:
+            spans = sorted(self.spans, key=lambda s: s.start)
+        return [{
+            'stage': s.name,
+            'depth': s.depth,
+            'seconds': s.duration,
+            'requests': s.requests,
+            'rows': s.rows,
+        } for s in spans]
+
+    def to_chrome(self):
+        """
+        Returns the trace in Chrome trace event format.
+        """
+        with _lock:
+            spans = list(self.spans)
+        events = [{
+            'name': s.name,
+            'ph': 'X',
+            'ts': (s.start - self.start) * 1e6,
+            'dur': s.duration * 1e6,
+            'pid': os.getpid(),
+            'tid': s.thread_id,
+            'args': {'requests': s.requests, 'rows': s.rows},
+        } for s in spans]
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def save(self, directory):
+        """
+        Writes the Chrome trace JSON into directory and returns its path.
+        """
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{self.name}_{datetime.now():%Y%m%d_%H%M%S_%f}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_chrome(), f)
+        return path
+
+@contextmanager
+def trace(name):
+    """
+    Starts a trace with a root span of the same name.
+    """
+    current = Trace(name)
+    trace_token = _current_trace.set(current)
+    spans_token = _open_spans.set(())
+    try:
+        with span(name):
+            yield current
+    finally:
+        _open_spans.reset(spans_token)
+        _current_trace.reset(trace_token)
+        if TRACE_DIR:
+            try:
+                current.save(TRACE_DIR)
+            except OSError as e:
+                print(f"Error writing trace: {e}")
+
+@contextmanager
+def span(name):
+    """
+    Records one stage of the current trace. Set .rows on the yielded span.
+    """
+    current = _current_trace.get()
+    parents = _open_spans.get()
+    s = Span(name, len(parents))
+    if current is None:
+        yield s
+        return
+    token = _open_spans.set(parents + (s,))
+    try:
+        yield s
+    finally:
+        s.duration = time.perf_counter() - s.start
+        _open_spans.reset(token)
+        with _lock:
+            current.spans.append(s)
+
+def record_request():
+    """
+    Counts one data request in every open span.
+    """
+    spans = _open_spans.get()
+    if spans:
+        with _lock:
+            for s in spans:
+                s.requests += 1
+
+def format_summary(stages):
+    """
+    One-line text of the top-level stages, e.g. "pdf 0.21s (1 req, 50 rows)".
+    """
+    parts = []
+    for stage in stages:
+        if stage['depth'] != 1:
+            continue
+        text = f"{stage['stage']} {stage['seconds']:.2f}s ({stage['requests']} req"
+        if stage['rows']:
+            text += f", {stage['rows']:,} rows"
+        parts.append(text + ")")
+    total = next((s['seconds'] for s in stages if s['depth'] == 0), None)
+    if total is not None:
+        parts.append(f"total {total:.2f}s")
+    return " | ".join(parts)
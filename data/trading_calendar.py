@@ -0,0 +1,151 @@
+import threading
+import time
+import numpy as np
+import pandas as pd
+from datetime import datetime, timedelta
+from data import sources
+from data.sources import stock
+from data.price_cache import PriceCache
+from data.fetch_executor import get_executor
+
+# First date covered by the calendar (KRX ETF market opened in 2002)
+CALENDAR_START = "20020101"
+
+# KOSPI trades on every KRX trading day, so its daily bars are the calendar
+CALENDAR_INDEX = "1001"
+
+# A failed (or empty) load is retried after this many seconds, not on every lookup
+RETRY_SECONDS = 60
+
+def _to_day(date):
+    if isinstance(date, str):
+        date = datetime.strptime(date.replace("-", ""), "%Y%m%d")
+    return np.datetime64(pd.Timestamp(date).date(), 'D')
+
+def _to_str(day):
+    return pd.Timestamp(day).strftime("%Y%m%d")
+
+class TradingCalendar:
+    """
+    KRX trading calendar built from KOSPI daily bars kept in the local price cache.
+    Dates after the last published bar (today, future) fall back to the weekday rule.
+    All lookups are local binary searches, no request per lookup.
+    """
+    def __init__(self):
+        self.price_cache = PriceCache()
+        self.executor = get_executor()
+        self.days = np.array([], dtype='datetime64[D]')
+        self.known_until = None
+        self.loaded_on = None
+        self.retry_at = 0.0
+        self.lock = threading.Lock()
+
+    def _ensure_loaded(self):
+        today = sources.today()
+        with self.lock:
+            if self.loaded_on == today or time.monotonic() < self.retry_at:
+                return
+            try:
+                # Only the days since the last run are requested (price cache gap filling)
+                df = self.price_cache.get(
+                    "index", CALENDAR_INDEX, CALENDAR_START, today.strftime("%Y%m%d"),
+                    lambda s, e: self.executor.call(stock.get_index_ohlcv_by_date, s, e, CALENDAR_INDEX)
+                )
+            except Exception as e:
+                print(f"Error loading trading calendar: {e}")
+                df = pd.DataFrame()
+            if df.empty:
+                # Keep what was loaded before (or the weekday rule) and try again later
+                self.retry_at = time.monotonic() + RETRY_SECONDS
+                return
+            self.days = np.unique(df.index.values.astype('datetime64[D]'))
+            yesterday = np.datetime64(today - timedelta(days=1), 'D')
+            # Bars up to yesterday are final; today is known only once its bar exists
+            self.known_until = max(self.days[-1], yesterday)
+            self.loaded_on = today
+
+    def is_loaded(self):
+        """
+        True if today's calendar is loaded, i.e. lookups will not download anything.
+        """
+        return self.loaded_on == sources.today()
+
+    def is_trading_day(self, date):
+        self._ensure_loaded()
+        day = _to_day(date)
+        if self.known_until is None or day < self.days[0] or day > self.known_until:
+            # Outside the published range: assume every weekday trades
+            return bool(np.is_busday(day))
+        i = np.searchsorted(self.days, day)
+        return i < len(self.days) and self.days[i] == day
+
+    def previous_trading_day(self, date, inclusive=True):
+        """
+        Returns the latest trading day on or before date (YYYYMMDD).
+        """
+        day = _to_day(date)
+        if not inclusive:
+            day -= 1
+        while not self.is_trading_day(day):
+            day -= 1
+        return _to_str(day)
+
+    @staticmethod
+    def previous_weekday(date, inclusive=True):
+        """
+        Weekday-rule previous_trading_day (YYYYMMDD) for callers that must not
+        wait for the calendar to load; holidays are not known.
+        """
+        day = _to_day(date)
+        if not inclusive:
+            day -= 1
+        return _to_str(np.busday_offset(day, 0, roll='backward'))
+
+    def next_trading_day(self, date, inclusive=True):
+        """
+        Returns the earliest trading day on or after date (YYYYMMDD).
+        """
+        day = _to_day(date)
+        if not inclusive:
+            day += 1
+        while not self.is_trading_day(day):
+            day += 1
+        return _to_str(day)
+
+    def trading_days_between(self, start_date, end_date):
+        """
+        Returns every trading day in [start_date, end_date] as YYYYMMDD strings.
+        """
+        self._ensure_loaded()
+        start, end = _to_day(start_date), _to_day(end_date)
+        days = np.arange(start, end + 1, dtype='datetime64[D]')
+        if self.known_until is None:
+            mask = np.is_busday(days)
+        else:
+            known = (days >= self.days[0]) & (days <= self.known_until)
+            mask = np.where(known, np.isin(days, self.days), np.is_busday(days))
+        return [_to_str(day) for day in days[mask]]
+
+    def snap_range(self, start_date, end_date):
+        """
+        Snaps [start_date, end_date] inwards to trading days.
+        Returns (None, None) if the range holds no trading day.
+        """
+        start = self.next_trading_day(start_date)
+        end = self.previous_trading_day(end_date)
+        if start > end:
+            return None, None
+        return start, end
+
+_calendar = None
+_calendar_lock = threading.Lock()
+
+def get_calendar():
+    """
+    Returns the process-wide TradingCalendar (loaded on first use).
+    """
+    global _calendar
+    with _calendar_lock:
+        if _calendar is None:
+            _calendar = TradingCalendar()
+        return _calendar
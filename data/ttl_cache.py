@@ -0,0 +1,79 @@
+import pickle
+import time
+from data.local_store import connect, db_lock
+
+class TTLCache:
+    """
+    Persistent key/value cache with a per-entry time-to-live.
+    Values are pickled into SQLite; once more than max_entries are stored,
+    the least recently used entries are evicted.
+    """
+    def __init__(self, db_name="ttl_cache.sqlite", max_entries=2000):
+        self.db_name = db_name
+        self.max_entries = max_entries
+        with db_lock:
+            conn = connect(self.db_name)
+            try:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS entries ("
+                    "key TEXT PRIMARY KEY, value BLOB, expires_at REAL, accessed_at REAL)"
+                )
+                conn.commit()
+            finally:
+                conn.close()
+
+    def get(self, key):
+        """
+        Returns the cached value, or None if missing or expired.
+        """
+        now = time.time()
+        with db_lock:
+            conn = connect(self.db_name)
+            try:
+                row = conn.execute("SELECT value, expires_at FROM entries WHERE key=?", (key,)).fetchone()
+                if row is None:
+                    return None
+                if row[1] < now:
+                    conn.execute("DELETE FROM entries WHERE key=?", (key,))
+                    conn.commit()
+                    return None
+                conn.execute("UPDATE entries SET accessed_at=? WHERE key=?", (now, key))
+                conn.commit()
+            finally:
+                conn.close()
+        return pickle.loads(row[0])
+
+    def set(self, key, value, ttl):
+        """
+        Stores value for ttl seconds and evicts the least recently used entries if needed.
+        """
+        now = time.time()
+        with db_lock:
+            conn = connect(self.db_name)
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)",
+                    (key, pickle.dumps(value), now + ttl, now)
+                )
+                conn.execute("DELETE FROM entries WHERE expires_at < ?", (now,))
+                conn.execute(
+                    "DELETE FROM entries WHERE key IN ("
+                    "SELECT key FROM entries ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)
+                )
+                conn.commit()
+            finally:
+                conn.close()
+
+    def get_or_fetch(self, key, ttl, fetch_func):
+        """
+        Returns the cached value or calls fetch_func() and caches its result.
+        Empty results (None, empty DataFrame/dict) are not cached.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+        value = fetch_func()
+        if value is not None and len(value) > 0:
+            self.set(key, value, ttl)
+        return value
@@ -0,0 +1,13 @@
+from data.etf_classifier import classify, classify_names
+
+def test_short_keyword_not_matched_inside_words():
+    # "IT" inside the issuer name MERITZ is not the IT sector
+    assert classify("MERITZ 200")['sector'] is None
+    assert classify("KODEX IT")['sector'] == "IT"
+    assert classify("ACE CSI300")['region'] == "China"
+
+def test_classify_names_matches_classify():
+    names = ["MERITZ 200", "KODEX IT", "TIGER 소프트웨어", "KODEX 레버리지2X", "TIGER 미국채10년"]
+    df = classify_names(names)
+    for i, name in enumerate(names):
+        assert df.iloc[i].to_dict() == classify(name)
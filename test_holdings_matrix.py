@@ -0,0 +1,116 @@
+import numpy as np
+import pandas as pd
+from data import local_store
+from data import holdings_matrix
+from data.holdings_matrix import HoldingsMatrix, get_holdings_matrix
+
+DATE = "20240105"
+
+def make_pdfs(etfs=12, seed=0):
+    # Overlapping baskets drawn from a small stock pool
+    rng = np.random.default_rng(seed)
+    stocks = [f"{i:06d}" for i in range(50)]
+    pdfs = {}
+    for i in range(etfs):
+        held = sorted(rng.choice(stocks, 15, replace=False))
+        amounts = rng.uniform(1000, 2000, len(held))
+        pdfs[f"E{i:05d}"] = pd.DataFrame(
+            {'금액': amounts, '비중': amounts / amounts.sum() * 100},
+            index=pd.Index(held, name='티커')
+        )
+    return pdfs
+
+class StubCalendar:
+    def previous_trading_day(self, date):
+        return date
+
+class StubExecutor:
+    def map(self, func, items):
+        return [func(item) for item in items]
+
+class StubFetcher:
+    # PDFs of the tickers in `failing` come back empty, like a failed pykrx request
+    def __init__(self, pdfs, failing=(), foreign=()):
+        self.pdfs = pdfs
+        self.failing = set(failing)
+        self.foreign = set(foreign)
+        self.requests = []
+        self.calendar = StubCalendar()
+        self.executor = StubExecutor()
+
+    def get_etf_universe(self, date=None):
+        return pd.DataFrame(
+            {'name': [f"ETF {t}" for t in self.pdfs],
+             'category': ["Foreign" if t in self.foreign else "Domestic" for t in self.pdfs]},
+            index=list(self.pdfs)
+        )
+
+    def get_etf_pdf(self, ticker, date, listed=False):
+        self.requests.append(ticker)
+        if ticker in self.failing:
+            return pd.DataFrame()
+        return self.pdfs[ticker].copy()
+
+def check_rows(matrix, pdfs):
+    for etf, pdf in pdfs.items():
+        expected = (pdf['비중'] / 100).sort_values(ascending=False)
+        pd.testing.assert_series_equal(matrix.row(etf), expected, check_names=False, check_index_type=False)
+
+def test_failed_pdfs_are_refetched(tmp_path, monkeypatch):
+    monkeypatch.setattr(local_store, "CACHE_DIR", str(tmp_path))
+    pdfs = make_pdfs()
+    failing = ["E00003", "E00007"]
+    fetcher = StubFetcher(pdfs, failing)
+
+    partial = HoldingsMatrix.build(fetcher, DATE)
+    assert partial.missing == failing
+    assert all(t not in partial for t in failing)
+    # The partial build is saved with its missing ETFs
+    assert HoldingsMatrix.load(DATE).missing == failing
+
+    # The next build only fetches the missing ETFs and completes the matrix
+    fetcher.failing.clear()
+    fetcher.requests.clear()
+    matrix = HoldingsMatrix.build(fetcher, DATE)
+    assert fetcher.requests == failing
+    assert matrix.missing == []
+    assert sorted(matrix.etfs) == sorted(pdfs)
+    check_rows(matrix, pdfs)
+    assert matrix.names["E00003"] == "ETF E00003"
+
+    # Complete builds come from the saved file without any request
+    fetcher.requests.clear()
+    saved = HoldingsMatrix.build(fetcher, DATE)
+    assert fetcher.requests == []
+    check_rows(saved, pdfs)
+
+def test_shared_matrix_retries_missing(tmp_path, monkeypatch):
+    monkeypatch.setattr(local_store, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(holdings_matrix, "_matrix", None)
+    monkeypatch.setattr(HoldingsMatrix, "target_date", staticmethod(lambda fetcher, date=None: DATE))
+    pdfs = make_pdfs()
+    fetcher = StubFetcher(pdfs, ["E00001"])
+
+    assert "E00001" not in get_holdings_matrix(fetcher)
+    fetcher.failing.clear()
+    matrix = get_holdings_matrix(fetcher)
+    assert "E00001" in matrix
+    assert matrix.missing == []
+    check_rows(matrix, pdfs)
+
+def test_shared_matrix_adds_requested_etf(tmp_path, monkeypatch):
+    monkeypatch.setattr(local_store, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(holdings_matrix, "_matrix", None)
+    monkeypatch.setattr(HoldingsMatrix, "target_date", staticmethod(lambda fetcher, date=None: DATE))
+    pdfs = make_pdfs()
+    # Outside the domestic universe, so the whole-universe build leaves it out
+    fetcher = StubFetcher(pdfs, foreign=["E00011"])
+    assert "E00011" not in get_holdings_matrix(fetcher)
+
+    fetcher.requests.clear()
+    matrix = get_holdings_matrix(fetcher, ticker="E00011")
+    assert fetcher.requests == ["E00011"]
+    assert matrix.names["E00011"] == "ETF E00011"
+    check_rows(matrix, pdfs)
+    # The added row is saved with the shared matrix
+    assert "E00011" in HoldingsMatrix.load(DATE)
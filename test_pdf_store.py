@@ -0,0 +1,69 @@
+import random
+import numpy as np
+import pandas as pd
+from data.local_store import connect
+from data.pdf_store import PDFStore, FULL_EVERY
+
+def make_baskets(days=120, seed=0):
+    # A basket that barely changes: a few share counts a day, a swap now and then
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2024-01-02", periods=days).strftime("%Y%m%d")
+    tickers = [f"{i:06d}" for i in range(60)]
+    shares = pd.Series(rng.integers(10, 1000, 40).astype(float), index=tickers[:40])
+    baskets = {}
+    for i, date in enumerate(dates):
+        changed = rng.choice(shares.index, 2, replace=False)
+        shares[changed] += 1
+        if i % 10 == 9:
+            out, new = shares.index[rng.integers(len(shares))], tickers[40 + (i // 10) % 20]
+            if new not in shares.index:
+                shares = shares.drop(out)
+                shares[new] = 100.0
+        held = shares.sort_index()
+        amounts = held.to_numpy() * rng.uniform(1000, 2000, len(held))
+        baskets[date] = pd.DataFrame(
+            {'구성종목명': [f"S{t}" for t in held.index], '계약수': held.to_numpy(),
+             '금액': amounts, '비중': amounts / amounts.sum() * 100},
+            index=pd.Index(held.index, name='티커')
+        )
+    return baskets
+
+def delta_runs(store, etf):
+    # Longest number of deltas applied after a full snapshot to rebuild a day
+    conn = connect(store.db_name)
+    try:
+        rows = conn.execute("SELECT full FROM baskets WHERE etf=? ORDER BY date", (etf,)).fetchall()
+    finally:
+        conn.close()
+    longest = run = 0
+    for (full,) in rows:
+        run = 0 if full else run + 1
+        longest = max(longest, run)
+    return longest
+
+def check_round_trip(store, baskets):
+    for date, basket in baskets.items():
+        pd.testing.assert_frame_equal(store.load("ETF", date), basket, check_dtype=False)
+
+def test_out_of_order_single_days(tmp_path):
+    baskets = make_baskets()
+    store = PDFStore(str(tmp_path / "pdf_store.sqlite"))
+    for date in reversed(list(baskets)):
+        store.store("ETF", {date: baskets[date]})
+    assert delta_runs(store, "ETF") < FULL_EVERY
+    check_round_trip(store, baskets)
+
+def test_out_of_order_backfill(tmp_path):
+    baskets = make_baskets()
+    store = PDFStore(str(tmp_path / "pdf_store.sqlite"))
+    dates = list(baskets)
+    rng = random.Random(0)
+    rng.shuffle(dates)
+    # Random single-day lookups and small batches, like get() and backfill() produce
+    while dates:
+        size = rng.randint(1, 5)
+        batch, dates = dates[:size], dates[size:]
+        store.backfill("ETF", batch, lambda missing: [baskets[d] for d in missing])
+    assert delta_runs(store, "ETF") < FULL_EVERY
+    check_round_trip(store, baskets)
+    assert list(store.scan("ETF", min(baskets), max(baskets))) == list(baskets)
@@ -0,0 +1,177 @@
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PyQt6.QtGui import QColor
+import numpy as np
+import pandas as pd
+
+# (header, format) of the constituent table columns
+COLUMNS = [
+    ("Name", None),
+    ("Weight (%)", "{:.2f}"),
+    ("Amount", "{:,.0f}"),
+    ("Return (%)", "{:.2f}"),
+    ("Contrib (%)", "{:.2f}"),
+]
+
+NAME, WEIGHT, AMOUNT, RETURN, CONTRIB = range(len(COLUMNS))
+
+# Contributions beyond +-0.5% are highlighted
+CONTRIB_HIGHLIGHT = 0.5
+
+RED, BLUE = QColor("red"), QColor("blue")
+LIGHT_GREEN, LIGHT_RED = QColor("#e6ffe6"), QColor("#ffe6e6")
+
+class ConstituentTableModel(QAbstractTableModel):
+    """
+    Constituent (PDF) table over columnar NumPy arrays.
+
+    Cells are formatted on demand, so only the visible rows cost anything,
+    and sorting only replaces the row permutation `order` (view row -> data
+    row) computed with argsort; the arrays themselves never move.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.tickers = np.array([], dtype=object)
+        self.names = np.array([], dtype=object)
+        # Numeric columns (WEIGHT.. CONTRIB), NaN when the PDF has no such column
+        self.values = {col: np.array([], dtype=float) for col in (WEIGHT, AMOUNT, RETURN, CONTRIB)}
+        self.order = np.array([], dtype=np.intp)
+
+    def set_frame(self, df, weight_col=None, amount_col=None):
+        """
+        Loads a PDF DataFrame (index=ticker); rows keep the DataFrame's order
+        as the default order.
+        """
+        def numeric(col):
+            if col is None or col not in df.columns:
+                return np.full(len(df), np.nan)
+            return pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=float)
+
+        self.beginResetModel()
+        self.tickers = df.index.astype(str).to_numpy(dtype=object)
+        if 'Name' in df.columns:
+            self.names = df['Name'].fillna(pd.Series(self.tickers, index=df.index)).astype(str).to_numpy(dtype=object)
+        else:
+            self.names = self.tickers.copy()
+        self.values = {
+            WEIGHT: numeric(weight_col),
+            AMOUNT: numeric(amount_col),
+            RETURN: numeric('Return'),
+            CONTRIB: numeric('Contribution'),
+        }
+        self.order = np.arange(len(df))
+        self.endResetModel()
+
+    def sort_rows(self, column, sort_order):
+        """
+        sort_order: 0 default order, 1 descending, 2 ascending.
+        Missing values always go last.
+        """
+        self.beginResetModel()
+        if sort_order == 0:
+            self.order = np.arange(len(self.tickers))
+        elif column == NAME:
+            order = np.argsort(self.names, kind='stable')
+            self.order = order[::-1].copy() if sort_order == 1 else order
+        else:
+            values = self.values[column]
+            keys = -values if sort_order == 1 else values
+            # argsort puts NaN last in both directions
+            self.order = np.argsort(keys, kind='stable')
+        self.endResetModel()
+
+    # --- Row access (view row -> data) ---
+
+    def source_rows(self, rows):
+        return self.order[np.asarray(rows, dtype=np.intp)]
+
+    def ticker(self, row):
+        return self.tickers[self.order[row]]
+
+    def name(self, row):
+        return self.names[self.order[row]]
+
+    # --- Selection statistics ---
+
+    def selection_stats(self, ranges):
+        """
+        Statistics of the selected cells straight from the arrays.
+
+        ranges: (top, bottom, left, right) view rectangles of the selection.
+        Returns (row count, {column: {'count', 'sum', 'mean', 'weighted_mean'}})
+        for the numeric columns with selected cells; weighted_mean is weighted
+        by the rows' basket weight. Missing values are skipped.
+        """
+        n = len(self.order)
+        masks = {}
+        for top, bottom, left, right in ranges:
+            rows = self.order[top:bottom + 1]
+            for col in range(left, right + 1):
+                mask = masks.get(col)
+                if mask is None:
+                    mask = masks[col] = np.zeros(n, dtype=bool)
+                mask[rows] = True
+        if not masks:
+            return 0, {}
+
+        row_count = int(np.logical_or.reduce(list(masks.values())).sum())
+        weights = self.values[WEIGHT]
+        stats = {}
+        for col, mask in sorted(masks.items()):
+            if col == NAME:
+                continue
+            values = self.values[col][mask]
+            valid = ~np.isnan(values)
+            values = values[valid]
+            w = weights[mask][valid]
+            w = np.where(np.isnan(w), 0.0, w)
+            count = len(values)
+            stats[col] = {
+                'count': count,
+                'sum': float(values.sum()),
+                'mean': float(values.mean()) if count else np.nan,
+                'weighted_mean': float((values * w).sum() / w.sum()) if w.sum() > 0 else np.nan,
+            }
+        return row_count, stats
+
+    # --- QAbstractTableModel ---
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.order)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return COLUMNS[section][0]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row, col = self.order[index.row()], index.column()
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            if col == NAME:
+                return self.names[row]
+            value = self.values[col][row]
+            return "N/A" if np.isnan(value) else COLUMNS[col][1].format(value)
+
+        if role == Qt.ItemDataRole.UserRole:
+            return self.names[row] if col == NAME else float(self.values[col][row])
+
+        if role == Qt.ItemDataRole.ForegroundRole and col in (RETURN, CONTRIB):
+            value = self.values[col][row]
+            threshold = CONTRIB_HIGHLIGHT if col == CONTRIB else 0.0
+            if value > threshold:
+                return RED
+            if value < -threshold:
+                return BLUE
+
+        if role == Qt.ItemDataRole.BackgroundRole and col == CONTRIB:
+            value = self.values[col][row]
+            if value > CONTRIB_HIGHLIGHT:
+                return LIGHT_GREEN
+            if value < -CONTRIB_HIGHLIGHT:
+                return LIGHT_RED
+        return None
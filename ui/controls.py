@@ -1,7 +1,7 @@
 from PyQt6.QtWidgets import QWidget, QHBoxLayout, QPushButton
 
 class ControlButtonWidget(QWidget):
-    def __init__(self, run_callback, exit_callback, foreign_callback=None):
+    def __init__(self, run_callback, exit_callback, foreign_callback=None, screener_callback=None):
         super().__init__()
         
         layout = QHBoxLayout(self)
@@ -46,6 +46,24 @@ class ControlButtonWidget(QWidget):
             self.foreign_btn.clicked.connect(foreign_callback)
             layout.addWidget(self.foreign_btn)
         
+        if screener_callback:
+            self.screener_btn = QPushButton("ETF 스크리너")
+            self.screener_btn.setMinimumHeight(40)
+            self.screener_btn.setStyleSheet("""
+                QPushButton {
+                    background-color: #9C27B0; 
+                    color: white; 
+                    font-weight: bold; 
+                    border-radius: 5px; 
+                    padding: 5px 15px;
+                }
+                QPushButton:hover {
+                    background-color: #7B1FA2;
+                }
+            """)
+            self.screener_btn.clicked.connect(screener_callback)
+            layout.addWidget(self.screener_btn)
+        
         self.exit_btn = QPushButton("종료")
         self.exit_btn.setMinimumHeight(40)
         self.exit_btn.setStyleSheet("""
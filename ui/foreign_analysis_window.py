@@ -7,6 +7,7 @@ from PyQt6.QtWebEngineWidgets import QWebEngineView
 import plotly.graph_objects as go
 import pandas as pd
 import datetime
+from data.tracing import format_summary
 
 class ForeignAnalysisWorker(QThread):
     finished = pyqtSignal(str, float, object, object) # ticker, total_return, price_df, holdings_df
@@ -17,49 +18,45 @@ class ForeignAnalysisWorker(QThread):
         self.ticker = ticker
         self.start_date = start_date
         self.end_date = end_date
+        self.stages = []
 
     def run(self):
         try:
             from data.foreign_data import ForeignDataFetcher
-            fetcher = ForeignDataFetcher()
+            from data.tracing import trace
+            with trace("foreign_analysis") as tr:
+                fetcher = ForeignDataFetcher()
             
-            # 1. Fetch Price History
-            df = fetcher.get_price_history(self.ticker, self.start_date, self.end_date)
+                # 1. Fetch Top Holdings (needed to know which symbols to download)
+                holdings = fetcher.get_top_holdings(self.ticker)
             
-            if df.empty:
-                self.error.emit("No data found for this ticker/period.")
-                return
-
-            # Calculate Total Return
-            start_price = df['Close'].iloc[0]
-            end_price = df['Close'].iloc[-1]
-            total_return = (end_price - start_price) / start_price * 100
+                # 2. Fetch the ETF and all of its holdings in one multi-symbol request
+                etf_symbol = self.ticker.upper()
+                symbols = [etf_symbol] + [str(symbol) for symbol in holdings.index]
+                closes = fetcher.get_price_histories(symbols, self.start_date, self.end_date)
             
-            # 2. Fetch Top Holdings
-            holdings = fetcher.get_top_holdings(self.ticker)
+                df = closes[[etf_symbol]].dropna().rename(columns={etf_symbol: 'Close'})
+                if df.empty:
+                    self.error.emit("No data found for this ticker/period.")
+                    return
+
+                # Period returns of every symbol in one vectorized step
+                returns = fetcher.get_period_returns(closes)
+                total_return = returns[etf_symbol]
             
-            # 3. Calculate Contribution for Top Holdings
-            if not holdings.empty:
-                holdings['Return'] = 0.0
-                holdings['Contribution'] = 0.0
+                # 3. Calculate Contribution for Top Holdings
+                if not holdings.empty:
+                    holdings['Return'] = returns.reindex(holdings.index.astype(str).str.upper()).fillna(0.0).values
+                    holdings['Contribution'] = 0.0
                 
-                # Iterate over holdings
-                for symbol, row in holdings.iterrows():
-                    # Fetch stock history
-                    stock_df = fetcher.get_price_history(str(symbol), self.start_date, self.end_date)
-                    if not stock_df.empty:
-                        s_start = stock_df['Close'].iloc[0]
-                        s_end = stock_df['Close'].iloc[-1]
-                        s_ret = (s_end - s_start) / s_start * 100
-                        
-                        holdings.loc[symbol, 'Return'] = s_ret
-                        # Weight is decimal (e.g. 0.07), so Contribution = Return * Weight
-                        # Check if weight is 'Holding Percent' or 'Weight'
-                        weight_col = 'Holding Percent' if 'Holding Percent' in holdings.columns else 'Weight'
-                        if weight_col in holdings.columns:
-                            weight = row[weight_col]
-                            holdings.loc[symbol, 'Contribution'] = s_ret * weight
-            
+                    # Weight is decimal (e.g. 0.07), so Contribution = Return * Weight
+                    # Check if weight is 'Holding Percent' or 'Weight'
+                    weight_col = 'Holding Percent' if 'Holding Percent' in holdings.columns else 'Weight'
+                    if weight_col in holdings.columns:
+                        holdings['Contribution'] = holdings['Return'] * holdings[weight_col]
+
+            # Per-stage timings / request counts, shown under the summary
+            self.stages = tr.summary()
             self.finished.emit(self.ticker, total_return, df, holdings)
             
         except Exception as e:
@@ -115,6 +112,11 @@ class ForeignAnalysisWindow(QWidget):
         self.summary_label.setStyleSheet("font-size: 14px; font-weight: bold; margin: 10px 0;")
         layout.addWidget(self.summary_label)
         
+        # Stage Timing Label
+        self.stages_label = QLabel("")
+        self.stages_label.setStyleSheet("font-size: 11px; color: #666;")
+        layout.addWidget(self.stages_label)
+        
         # Chart
         self.web_view = QWebEngineView()
         self.web_view.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
@@ -193,6 +195,7 @@ class ForeignAnalysisWindow(QWidget):
         self.run_btn.setEnabled(True)
         self.run_btn.setText("분석")
         self.summary_label.setText(f"{ticker} Period Return: {total_return:.2f}%")
+        self.stages_label.setText(format_summary(self.worker.stages))
         
         # Update Chart
         self.update_chart(ticker, price_df)
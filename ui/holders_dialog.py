@@ -0,0 +1,38 @@
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QLabel, QTableWidget, QTableWidgetItem,
+                             QHeaderView, QPushButton, QHBoxLayout)
+
+class StockHoldersDialog(QDialog):
+    """
+    Lists every domestic ETF holding a stock (from the reverse holdings index).
+    holders: list of (ETF ticker, name, weight (%), amount), largest weight first.
+    """
+    def __init__(self, stock, stock_name, holders, date, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(f"보유 ETF - {stock_name}")
+        self.resize(600, 500)
+
+        layout = QVBoxLayout(self)
+
+        info_label = QLabel(f"{stock_name} ({stock})을(를) 보유한 ETF {len(holders)}개 ({date} PDF 기준)")
+        info_label.setStyleSheet("font-weight: bold;")
+        layout.addWidget(info_label)
+
+        table = QTableWidget()
+        table.setColumnCount(4)
+        table.setHorizontalHeaderLabels(["Ticker", "Name", "Weight (%)", "Amount"])
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        table.setRowCount(len(holders))
+        for i, (etf, name, weight, amount) in enumerate(holders):
+            table.setItem(i, 0, QTableWidgetItem(etf))
+            table.setItem(i, 1, QTableWidgetItem(name))
+            table.setItem(i, 2, QTableWidgetItem(f"{weight:.2f}"))
+            table.setItem(i, 3, QTableWidgetItem(f"{amount:,.0f}"))
+        layout.addWidget(table)
+
+        btn_layout = QHBoxLayout()
+        btn_layout.addStretch()
+        close_btn = QPushButton("닫기")
+        close_btn.clicked.connect(self.accept)
+        btn_layout.addWidget(close_btn)
+        layout.addLayout(btn_layout)
@@ -1,4 +1,4 @@
-from PyQt6.QtWidgets import QWidget, QFormLayout, QLineEdit, QDateEdit, QVBoxLayout, QGroupBox, QCompleter, QPushButton, QHBoxLayout, QLabel
+from PyQt6.QtWidgets import QWidget, QFormLayout, QLineEdit, QDateEdit, QVBoxLayout, QGroupBox, QCompleter, QPushButton, QHBoxLayout, QLabel, QCheckBox
 from PyQt6.QtCore import QDate, Qt, QStringListModel, QThread, pyqtSignal
 
 class InputFormWidget(QWidget):
@@ -48,6 +48,11 @@ class InputFormWidget(QWidget):
         self.end_date.setDate(QDate.currentDate())
         group_layout.addRow("종료일 :", self.end_date)
         
+        # Daily attribution downloads one PDF and one market snapshot per trading day (cached)
+        self.daily_attribution = QCheckBox("일별 PDF 기여도 분석")
+        self.daily_attribution.setToolTip("매 거래일의 PDF와 종목 수익률로 기여도를 계산합니다. (첫 실행 시 시간이 걸립니다)")
+        group_layout.addRow("", self.daily_attribution)
+        
         group_box.setLayout(group_layout)
         layout.addWidget(group_box)
         
@@ -72,6 +77,9 @@ class InputFormWidget(QWidget):
     def get_end_date(self):
         return self.end_date.date().toString("yyyyMMdd")
 
+    def is_daily_attribution(self):
+        return self.daily_attribution.isChecked()
+
     def open_search_dialog(self):
         from ui.search_dialog import SearchDialog
         dialog = SearchDialog(self)
@@ -85,7 +93,13 @@ class InputFormWidget(QWidget):
         ticker = self.get_ticker()
         if not ticker:
             self.listing_date_label.setText("")
+            self.listing_ticker = None
+            return
+            
+        # editingFinished also fires on focus loss, skip if the ticker did not change
+        if ticker == getattr(self, 'listing_ticker', None):
             return
+        self.listing_ticker = ticker
             
         # Run in a separate thread or just call it? 
         # Since it might take a second, better to be async, but for now let's try synchronous for simplicity 
@@ -111,6 +125,8 @@ class InputFormWidget(QWidget):
             self.listing_date_label.setText(f"상장일: {date_str}")
         else:
             self.listing_date_label.setText("상장일: 알 수 없음")
+            # Failed lookup: let the same ticker be tried again
+            self.listing_ticker = None
 
 class ListingDateFetcher(QThread):
     result_ready = pyqtSignal(str)
@@ -1,11 +1,16 @@
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QStackedWidget, 
                              QLabel, QHBoxLayout, QMessageBox, QPushButton)
-from PyQt6.QtCore import Qt, QThread, pyqtSignal
+from PyQt6.QtCore import Qt, QThread, QTimer, pyqtSignal
 from ui.dashboard import DashboardWidget
 from ui.input_form import InputFormWidget
 from ui.controls import ControlButtonWidget
 from ui.result_view import ResultViewWidget
 from ui.foreign_analysis_window import ForeignAnalysisWindow
+from ui.screener_window import ScreenerWindow
+from data.analysis_state import AnalysisState
+
+# How often the holdings index checks for a new trading day
+HOLDINGS_REFRESH_MS = 30 * 60 * 1000
 
 # Worker for Market Data
 class MarketDataWorker(QThread):
@@ -21,124 +26,43 @@ class MarketDataWorker(QThread):
             print(f"Market data error: {e}")
             self.data_loaded.emit({}, "")
 
+# Worker for the Holdings Matrix (reverse index / similarity), built once per trading day
+class HoldingsWorker(QThread):
+    loaded = pyqtSignal(object)
+    
+    def run(self):
+        try:
+            from data.holdings_matrix import get_holdings_matrix
+            # Shared process-wide build; returns at once while the trading day is unchanged
+            self.loaded.emit(get_holdings_matrix())
+        except Exception as e:
+            print(f"Holdings index error: {e}")
+
 # Worker for ETF Analysis
 class AnalysisWorker(QThread):
     finished = pyqtSignal(str, str, float, object, object, dict) # ticker, name, return, price_df, pdf_df, metrics
     error = pyqtSignal(str)
     
-    def __init__(self, ticker, start_date, end_date):
+    def __init__(self, ticker, start_date, end_date, state=None, daily_attribution=False):
         super().__init__()
         self.ticker = ticker
         self.start_date = start_date
         self.end_date = end_date
+        self.state = state
+        self.daily_attribution = daily_attribution
         
     def run(self):
         try:
-            from data.etf_data import ETFDataFetcher
-            import pandas as pd
-            import numpy as np
-            
-            etf_fetcher = ETFDataFetcher()
-            
-            # Use Ticker as Name
-            name = self.ticker
-            
-            # 1. Fetch Price History
-            df = etf_fetcher.get_etf_price_history(self.ticker, self.start_date, self.end_date)
-            
-            if df.empty:
-                self.error.emit("No data found for this ticker/period.")
+            from data.analysis import analyze_etf, AnalysisError
+            try:
+                result = analyze_etf(
+                    self.ticker, self.start_date, self.end_date,
+                    state=self.state, daily_attribution=self.daily_attribution
+                )
+            except AnalysisError as e:
+                self.error.emit(str(e))
                 return
-                
-            # Calculate Returns
-            start_price = df['NAV'].iloc[0] if 'NAV' in df.columns else df['종가'].iloc[0]
-            end_price = df['NAV'].iloc[-1] if 'NAV' in df.columns else df['종가'].iloc[-1]
-            total_return = (end_price - start_price) / start_price * 100
-            
-            # 2. Fetch Benchmark (KOSPI)
-            bm_df = etf_fetcher.get_benchmark_data(self.start_date, self.end_date)
-            
-            # Calculate Daily Returns for Sharpe/IR
-            # Use '종가' for daily return calculation
-            etf_daily_ret = df['종가'].pct_change().dropna()
-            metrics = {
-                'sharpe': 'N/A',
-                'treynor': 'N/A',
-                'excess_return': 'N/A',
-                'alpha': 'N/A'
-            }
-            
-            if not bm_df.empty:
-                bm_daily_ret = bm_df['종가'].pct_change().dropna()
-                
-                # Align dates
-                combined = pd.concat([etf_daily_ret, bm_daily_ret], axis=1, join='inner')
-                combined.columns = ['etf', 'bm']
-                
-                if not combined.empty:
-                    # Excess Return (Total)
-                    bm_total_return = (bm_df['종가'].iloc[-1] - bm_df['종가'].iloc[0]) / bm_df['종가'].iloc[0] * 100
-                    metrics['excess_return'] = total_return - bm_total_return
-                    
-                    # Sharpe Ratio (assuming risk-free rate = 0 for simplicity, annualized)
-                    # Daily Sharpe * sqrt(252)
-                    std = combined['etf'].std()
-                    if std != 0:
-                        metrics['sharpe'] = (combined['etf'].mean() / std) * np.sqrt(252)
-                        
-                    # Treynor Ratio (Portfolio Return / Beta)
-                    # Beta = Cov(ETF, BM) / Var(BM)
-                    cov_matrix = combined.cov()
-                    if not cov_matrix.empty:
-                        beta = cov_matrix.loc['etf', 'bm'] / cov_matrix.loc['bm', 'bm']
-                        if beta != 0:
-                            metrics['treynor'] = (combined['etf'].mean() * 252) / beta
-
-            # 3. Attribution Analysis (Top 10 Holdings at Start)
-            # We use start_date PDF to see what contributed to the performance
-            pdf = etf_fetcher.get_etf_pdf(self.ticker, self.start_date)
-            
-            # If start_date PDF is empty (e.g. holiday), try next few days? 
-            # For now, if empty, try end_date just to show something (though attribution logic is flawed then)
-            if pdf.empty:
-                pdf = etf_fetcher.get_etf_pdf(self.ticker, self.end_date)
-                
-            # Add 'Return' and 'Contribution' columns to PDF
-            pdf['Return'] = 0.0
-            pdf['Contribution'] = 0.0
-            
-            if not pdf.empty:
-                # Find weight column
-                weight_col = None
-                for col in ['비중', 'Weight', 'weight']:
-                    if col in pdf.columns:
-                        weight_col = col
-                        break
-                
-                if weight_col:
-                    # Sort by weight and take top 50
-                    top_constituents = pdf.sort_values(by=weight_col, ascending=False).head(50)
-                    print(f"DEBUG: Calculating returns for {len(top_constituents)} constituents...")
-                    
-                    for ticker, row in top_constituents.iterrows():
-                        # Fetch stock history
-                        stock_df = etf_fetcher.get_stock_price_history(str(ticker), self.start_date, self.end_date)
-                        if not stock_df.empty:
-                            s_start = stock_df['종가'].iloc[0]
-                            s_end = stock_df['종가'].iloc[-1]
-                            s_ret = (s_end - s_start) / s_start * 100
-                            
-                            # Update PDF DataFrame
-                            pdf.loc[ticker, 'Return'] = s_ret
-                            pdf.loc[ticker, 'Contribution'] = s_ret * (row[weight_col] / 100)
-                            
-                    # Fetch Names for All Constituents
-                    pdf['Name'] = pdf.index # Default to ticker
-                    for ticker in pdf.index:
-                        name = etf_fetcher.get_stock_name(str(ticker))
-                        pdf.loc[ticker, 'Name'] = name
-
-            self.finished.emit(self.ticker, name, total_return, df, pdf, metrics)
+            self.finished.emit(*result)
             
         except Exception as e:
             import traceback
@@ -152,6 +76,9 @@ class MainWindow(QMainWindow):
         self.resize(1000, 700)
         
         self.foreign_window = None
+        self.screener_window = None
+        # Data of the last analysis, reused when only the window changes
+        self.analysis_state = AnalysisState()
         
         # Central Widget
         central_widget = QWidget()
@@ -173,6 +100,19 @@ class MainWindow(QMainWindow):
         
         # Set initial screen
         self.stacked_widget.setCurrentIndex(0)
+        
+        # Prebuild the holdings index so clicking a stock never scans the universe,
+        # and check periodically so a session left open picks up the next trading day
+        self.holdings_worker = HoldingsWorker()
+        self.holdings_worker.loaded.connect(self.result_screen.set_holdings)
+        self.refresh_holdings()
+        self.holdings_timer = QTimer(self)
+        self.holdings_timer.timeout.connect(self.refresh_holdings)
+        self.holdings_timer.start(HOLDINGS_REFRESH_MS)
+
+    def refresh_holdings(self):
+        if not self.holdings_worker.isRunning():
+            self.holdings_worker.start()
 
     def setup_input_screen(self):
         layout = QVBoxLayout(self.input_screen)
@@ -226,7 +166,7 @@ class MainWindow(QMainWindow):
         layout.addStretch()
         
         # Bottom Section: Controls
-        self.controls = ControlButtonWidget(self.run_analysis, self.close, self.open_foreign_analysis)
+        self.controls = ControlButtonWidget(self.run_analysis, self.close, self.open_foreign_analysis, self.open_screener)
         layout.addWidget(self.controls, alignment=Qt.AlignmentFlag.AlignBottom | Qt.AlignmentFlag.AlignRight)
 
     def load_market_data(self):
@@ -239,6 +179,7 @@ class MainWindow(QMainWindow):
         ticker = self.input_form.get_ticker()
         start_date = self.input_form.get_start_date()
         end_date = self.input_form.get_end_date()
+        daily_attribution = self.input_form.is_daily_attribution()
         
         if not ticker:
             QMessageBox.warning(self, "Input Error", "Please enter a ticker.")
@@ -249,7 +190,7 @@ class MainWindow(QMainWindow):
         self.controls.run_btn.setText("분석 중...")
         
         # Start Worker
-        self.analysis_worker = AnalysisWorker(ticker, start_date, end_date)
+        self.analysis_worker = AnalysisWorker(ticker, start_date, end_date, self.analysis_state, daily_attribution)
         self.analysis_worker.finished.connect(self.on_analysis_finished)
         self.analysis_worker.error.connect(self.on_analysis_error)
         self.analysis_worker.start()
@@ -277,4 +218,10 @@ class MainWindow(QMainWindow):
         if self.foreign_window is None:
             self.foreign_window = ForeignAnalysisWindow()
         self.foreign_window.show()
-        self.foreign_window.raise_()
\ No newline at end of file
+        self.foreign_window.raise_()
+
+    def open_screener(self):
+        if self.screener_window is None:
+            self.screener_window = ScreenerWindow()
+        self.screener_window.show()
+        self.screener_window.raise_()
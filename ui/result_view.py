@@ -1,10 +1,17 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QLabel, QPushButton, QHBoxLayout, 
-                             QTableWidget, QTableWidgetItem, QHeaderView, QSizePolicy, QFrame, QMessageBox)
+                             QTableView, QHeaderView, QSizePolicy, QFrame, QMessageBox)
 from PyQt6.QtWebEngineWidgets import QWebEngineView
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QColor
+from PyQt6.QtCore import Qt, QUrl
 import plotly.graph_objects as go
-import pandas as pd
+from plotly.subplots import make_subplots
+import os
+import numpy as np
+import tempfile
+from data.tracing import format_summary
+from ui.constituent_model import ConstituentTableModel, WEIGHT, AMOUNT, RETURN, CONTRIB
+
+# QWebEngineView.setHtml() accepts at most 2MB; keep some headroom
+SET_HTML_LIMIT = 1_500_000
 
 class ResultViewWidget(QWidget):
     def __init__(self, back_callback):
@@ -21,6 +28,10 @@ class ResultViewWidget(QWidget):
         
         top_layout.addStretch()
         
+        self.similar_btn = QPushButton("유사 ETF")
+        self.similar_btn.clicked.connect(self.show_similar_etfs)
+        top_layout.addWidget(self.similar_btn)
+        
         self.back_btn = QPushButton("뒤로")
         self.back_btn.clicked.connect(back_callback)
         top_layout.addWidget(self.back_btn)
@@ -68,6 +79,11 @@ class ResultViewWidget(QWidget):
             
         layout.addWidget(self.metrics_frame)
         
+        # Stage Timing Label (time / requests / rows per analysis stage)
+        self.stages_label = QLabel("")
+        self.stages_label.setStyleSheet("font-size: 11px; color: #666;")
+        layout.addWidget(self.stages_label)
+        
         # Chart Area
         self.web_view = QWebEngineView()
         # Set size policy to expand
@@ -79,23 +95,29 @@ class ResultViewWidget(QWidget):
         self.table_label.setStyleSheet("font-weight: bold; margin-top: 10px;")
         layout.addWidget(self.table_label)
         
-        self.constituent_table = QTableWidget()
-        self.constituent_table.setColumnCount(5)
-        self.constituent_table.setHorizontalHeaderLabels(["Name", "Weight (%)", "Amount", "Return (%)", "Contrib (%)"])
+        # Model/view over NumPy columns: cells are formatted only when visible
+        self.constituent_model = ConstituentTableModel(self)
+        self.constituent_table = QTableView()
+        self.constituent_table.setModel(self.constituent_model)
         self.constituent_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        self.constituent_table.itemSelectionChanged.connect(self.calculate_sum)
+        self.constituent_table.selectionModel().selectionChanged.connect(self.calculate_sum)
+        # Double click a stock to see every ETF holding it
+        self.constituent_table.doubleClicked.connect(self.show_holders)
         
         # Make Read-only
-        self.constituent_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.constituent_table.setEditTriggers(QTableView.EditTrigger.NoEditTriggers)
         
         # Custom Sorting
         self.constituent_table.horizontalHeader().setSectionsClickable(True)
         self.constituent_table.horizontalHeader().sectionClicked.connect(self.on_header_clicked)
         
+        self.ticker = None
+        # Holdings matrix of the whole universe (built in the background by the main window)
+        self.holdings = None
         self.sort_col = -1
         self.sort_order = 0 # 0: Default, 1: Desc, 2: Asc
-        self.original_df = pd.DataFrame()
-        self.current_df = pd.DataFrame()
+        self.weight_col = None
+        self.amount_col = None
         
         layout.addWidget(self.constituent_table, stretch=1)
         
@@ -105,6 +127,7 @@ class ResultViewWidget(QWidget):
         layout.addWidget(self.sum_label, alignment=Qt.AlignmentFlag.AlignRight)
         
     def display_results(self, ticker, name, total_return, price_df, pdf_df, metrics):
+        self.ticker = ticker
         if name == ticker:
             self.status_label.setText(f"Analysis for {ticker}: Total Return {total_return:.2f}%")
         else:
@@ -119,6 +142,9 @@ class ResultViewWidget(QWidget):
         self.treynor_label.setText(f"Treynor Ratio: {treynor:.2f}" if isinstance(treynor, (int, float)) else f"Treynor Ratio: {treynor}")
         self.excess_label.setText(f"Excess Return: {excess:.2f}%" if isinstance(excess, (int, float)) else f"Excess Return: {excess}")
         
+        # Update Stage Timings
+        self.stages_label.setText(format_summary(metrics.get('stages', [])))
+        
         # Update Price and Return
         if not price_df.empty:
             col = 'NAV' if 'NAV' in price_df.columns else '종가'
@@ -130,12 +156,16 @@ class ResultViewWidget(QWidget):
             self.period_return_label.setText("기간 수익률: -")
         
         # Update Chart
-        self.update_chart(ticker, name, price_df)
+        self.update_chart(ticker, name, price_df, metrics.get('rolling'))
         
         # Update PDF Table
+        if metrics.get('attribution') == 'daily':
+            self.table_label.setText("종목 분석 (일별 PDF 기준 기여도)")
+        else:
+            self.table_label.setText("종목 분석 (대표 포트폴리오)")
         self.update_constituents(pdf_df)
         
-    def update_chart(self, ticker, name, price_df):
+    def update_chart(self, ticker, name, price_df, rolling=None):
         if price_df.empty:
             self.web_view.setHtml("")
             return
@@ -143,35 +173,89 @@ class ResultViewWidget(QWidget):
         # Determine column to plot
         col = 'NAV' if 'NAV' in price_df.columns else '종가'
         
-        # Create Plotly Figure
-        fig = go.Figure()
+        # Rolling windows with at least one value (shorter histories skip the long ones)
+        rolling = {w: r for w, r in (rolling or {}).items() if r.notna().any().any()}
+        
+        # Create Plotly Figure (price on top, rolling metrics below on the same date axis)
+        if rolling:
+            fig = make_subplots(
+                rows=4, cols=1, shared_xaxes=True, vertical_spacing=0.04,
+                row_heights=[0.46, 0.18, 0.18, 0.18],
+                subplot_titles=("", "Rolling Sharpe", "Rolling Volatility", "Rolling Beta / Correlation")
+            )
+        else:
+            fig = go.Figure()
         
         # Add Trace
-        fig.add_trace(go.Scatter(
+        price_trace = go.Scatter(
             x=price_df.index, 
             y=price_df[col], 
             mode='lines', 
             name=col,
             hovertemplate='%{x|%Y-%m-%d}<br>%{y:,.0f}<extra></extra>'
-        ))
+        )
+        if rolling:
+            fig.add_trace(price_trace, row=1, col=1)
+        else:
+            fig.add_trace(price_trace)
+        
+        # Rolling traces: one group of 4 per window, only the selected window is visible
+        windows = sorted(rolling)
+        default_window = 60 if 60 in rolling else (windows[0] if windows else None)
+        for window in windows:
+            r = rolling[window]
+            visible = window == default_window
+            traces = [
+                ('sharpe', f"Sharpe {window}D", 2),
+                ('volatility', f"Volatility {window}D", 3),
+                ('beta', f"Beta {window}D", 4),
+                ('correlation', f"Correlation {window}D", 4),
+            ]
+            for metric, label, row in traces:
+                fig.add_trace(go.Scatter(
+                    x=r.index, y=r[metric], mode='lines', name=label, visible=visible,
+                    hovertemplate='%{y:.2f}'
+                ), row=row, col=1)
+        
+        if rolling:
+            # Window selector (client side, no recomputation)
+            buttons = []
+            for window in windows:
+                visible = [True] + [w == window for w in windows for _ in range(4)]
+                buttons.append(dict(label=f"{window}D", method="update", args=[{"visible": visible}]))
+            fig.update_layout(updatemenus=[dict(
+                buttons=buttons, direction="right", type="buttons",
+                active=windows.index(default_window), x=0, xanchor="left", y=1.08, yanchor="bottom"
+            )])
         
         # Update Layout
         title_text = f"{ticker} 성과"
         fig.update_layout(
             title=dict(text=title_text, x=0.5, xanchor='center'),
-            xaxis_title="날짜",
             yaxis_title="가격",
             margin=dict(l=20, r=20, t=40, b=20),
             hovermode="x unified"
         )
+        if not rolling:
+            fig.update_layout(xaxis_title="날짜")
         
         # Convert to HTML
         html = fig.to_html(include_plotlyjs='cdn')
-        self.web_view.setHtml(html)
+        self.show_html(html)
+        
+    def show_html(self, html):
+        # setHtml() is limited to 2MB; long histories with rolling traces go through a file
+        if len(html) < SET_HTML_LIMIT:
+            self.web_view.setHtml(html)
+            return
+        path = os.path.join(tempfile.gettempdir(), f"etf_analysis_chart_{os.getpid()}.html")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(html)
+        self.web_view.load(QUrl.fromLocalFile(path))
         
     def update_constituents(self, pdf_df):
         if pdf_df.empty:
-            self.constituent_table.setRowCount(0)
+            self.populate_table(pdf_df)
             return
             
         # Check available columns
@@ -191,144 +275,86 @@ class ResultViewWidget(QWidget):
                 self.amount_col = col
                 break
         
-        # Initial Sort by Weight Descending
+        # Initial Sort by Weight Descending (the default order of the table)
         if self.weight_col:
             pdf_df = pdf_df.sort_values(by=self.weight_col, ascending=False)
-            
-        # Store original DF (top 50 or all)
-        self.original_df = pdf_df.head(50).copy()
+        
+        self.populate_table(pdf_df)
+        
+    def populate_table(self, df):
+        # The whole PDF is shown, the model only keeps its columns as arrays
+        self.constituent_model.set_frame(df, self.weight_col, self.amount_col)
         
         # Reset Sort State
         self.sort_col = -1
         self.sort_order = 0
-        
-        self.populate_table(self.original_df)
-        
-    def populate_table(self, df):
-        self.current_df = df
-        self.constituent_table.setRowCount(len(df))
-        self.constituent_table.setSortingEnabled(False) # Disable built-in sorting
-        
-        for row_idx, (index, row) in enumerate(df.iterrows()):
-            # Name (Index or Name column)
-            name_val = row.get('Name', str(index))
-            name_item = QTableWidgetItem(str(name_val))
-            self.constituent_table.setItem(row_idx, 0, name_item)
-            
-            # Weight
-            weight_val = row[self.weight_col] if self.weight_col else "N/A"
-            if isinstance(weight_val, (int, float)):
-                weight_str = f"{weight_val:.2f}"
-                weight_item = QTableWidgetItem()
-                weight_item.setData(Qt.ItemDataRole.DisplayRole, weight_val) # For proper sorting if we used built-in
-                weight_item.setText(weight_str)
-            else:
-                weight_str = str(weight_val)
-                weight_item = QTableWidgetItem(weight_str)
-            self.constituent_table.setItem(row_idx, 1, weight_item)
-            
-            # Amount
-            amount_val = row[self.amount_col] if self.amount_col else "N/A"
-            if isinstance(amount_val, (int, float)):
-                amount_str = f"{amount_val:,.0f}"
-                amount_item = QTableWidgetItem()
-                amount_item.setData(Qt.ItemDataRole.DisplayRole, amount_val)
-                amount_item.setText(amount_str)
-            else:
-                amount_str = str(amount_val)
-                amount_item = QTableWidgetItem(amount_str)
-            self.constituent_table.setItem(row_idx, 2, amount_item)
-            
-            # Return
-            ret_val = row.get('Return', 0.0)
-            ret_item = QTableWidgetItem()
-            ret_item.setData(Qt.ItemDataRole.DisplayRole, ret_val)
-            ret_item.setText(f"{ret_val:.2f}")
-            
-            if ret_val > 0:
-                ret_item.setForeground(QColor("red"))
-            elif ret_val < 0:
-                ret_item.setForeground(QColor("blue"))
-            self.constituent_table.setItem(row_idx, 3, ret_item)
-            
-            # Contribution
-            contrib_val = row.get('Contribution', 0.0)
-            contrib_item = QTableWidgetItem()
-            contrib_item.setData(Qt.ItemDataRole.DisplayRole, contrib_val)
-            contrib_item.setText(f"{contrib_val:.2f}")
-            
-            # Highlight significant contribution (> 0.5% or < -0.5%)
-            if contrib_val > 0.5:
-                contrib_item.setBackground(QColor("#e6ffe6")) # Light Green
-                contrib_item.setForeground(QColor("red"))
-            elif contrib_val < -0.5:
-                contrib_item.setBackground(QColor("#ffe6e6")) # Light Red
-                contrib_item.setForeground(QColor("blue"))
-                
-            self.constituent_table.setItem(row_idx, 4, contrib_item)
+        self.constituent_table.horizontalHeader().setSortIndicatorShown(False)
+        self.calculate_sum()
             
     def on_header_clicked(self, logicalIndex):
         # Cycle: Desc (1) -> Asc (2) -> Default (0)
         if self.sort_col == logicalIndex:
             self.sort_order = (self.sort_order + 1) % 3
-            if self.sort_order == 0:
-                # Skip 0 if we want to toggle only, but user asked for Default.
-                # 0 means Default.
-                pass
         else:
             self.sort_col = logicalIndex
             self.sort_order = 1 # Start with Descending
             
-        # Perform Sort
+        # Sorting only replaces the model's row permutation
+        self.constituent_model.sort_rows(logicalIndex, self.sort_order)
+        
+        header = self.constituent_table.horizontalHeader()
         if self.sort_order == 0:
-            # Default Order
-            self.populate_table(self.original_df)
-            self.constituent_table.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder) # Hide indicator logic if possible or just ignore
+            header.setSortIndicatorShown(False)
         else:
-            # Determine column name to sort by
-            col_name = None
-            if logicalIndex == 0: # Name
-                col_name = 'Name'
-            elif logicalIndex == 1: # Weight
-                col_name = self.weight_col
-            elif logicalIndex == 2: # Amount
-                col_name = self.amount_col
-            elif logicalIndex == 3: # Return
-                col_name = 'Return'
-            elif logicalIndex == 4: # Contrib
-                col_name = 'Contribution'
-                
-            if col_name:
-                ascending = (self.sort_order == 2)
-                sorted_df = self.original_df.sort_values(by=col_name, ascending=ascending)
-                self.populate_table(sorted_df)
-                
-                # Update Header Indicator (Visual only)
-                qt_order = Qt.SortOrder.AscendingOrder if ascending else Qt.SortOrder.DescendingOrder
-                self.constituent_table.horizontalHeader().setSortIndicator(logicalIndex, qt_order)
+            ascending = (self.sort_order == 2)
+            qt_order = Qt.SortOrder.AscendingOrder if ascending else Qt.SortOrder.DescendingOrder
+            header.setSortIndicatorShown(True)
+            header.setSortIndicator(logicalIndex, qt_order)
             
     def calculate_sum(self):
-        selected_items = self.constituent_table.selectedItems()
-        if not selected_items:
+        # Taken from the model's arrays over the selection rectangles, not from cell text
+        selection = self.constituent_table.selectionModel().selection()
+        ranges = [(r.top(), r.bottom(), r.left(), r.right()) for r in selection]
+        count, stats = self.constituent_model.selection_stats(ranges)
+        if count == 0:
             self.sum_label.setText("합계: -")
             return
-            
-        total_sum = 0.0
-        count = 0
-        
-        for item in selected_items:
-            text = item.text().replace(",", "").replace("%", "")
-            try:
-                val = float(text)
-                total_sum += val
-                count += 1
-            except ValueError:
-                pass
-                
-        if count > 0:
-            self.sum_label.setText(f"개수: {count} | 합계: {total_sum:,.2f}")
-        else:
-            self.sum_label.setText("합계: -")
+        
+        parts = [f"개수: {count}"]
+        if WEIGHT in stats:
+            parts.append(f"비중 합계: {stats[WEIGHT]['sum']:,.2f}%")
+        if AMOUNT in stats:
+            parts.append(f"금액 합계: {stats[AMOUNT]['sum']:,.0f}")
+        if RETURN in stats and stats[RETURN]['count']:
+            text = f"수익률 평균: {stats[RETURN]['mean']:,.2f}%"
+            if not np.isnan(stats[RETURN]['weighted_mean']):
+                text += f" (비중 가중 {stats[RETURN]['weighted_mean']:,.2f}%)"
+            parts.append(text)
+        if CONTRIB in stats:
+            parts.append(f"기여도 합계: {stats[CONTRIB]['sum']:,.2f}%")
+        self.sum_label.setText(" | ".join(parts))
+
+    def show_similar_etfs(self):
+        if not self.ticker:
+            return
+        from ui.similar_etf_dialog import SimilarETFDialog
+        self.similar_dialog = SimilarETFDialog(self.ticker, self)
+        self.similar_dialog.show()
+
+    def set_holdings(self, matrix):
+        self.holdings = matrix
+
+    def show_holders(self, index):
+        if not index.isValid():
+            return
+        if self.holdings is None:
+            QMessageBox.information(self, "보유 ETF", "ETF 보유 종목 인덱스를 준비 중입니다. 잠시 후 다시 시도하세요.")
+            return
+        stock = self.constituent_model.ticker(index.row())
+        name = self.constituent_model.name(index.row())
+        from ui.holders_dialog import StockHoldersDialog
+        self.holders_dialog = StockHoldersDialog(stock, name, self.holdings.holders(stock), self.holdings.date, self)
+        self.holders_dialog.show()
 
     def show_metrics_help(self):
         msg = QMessageBox(self)
@@ -0,0 +1,153 @@
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+                             QDateEdit, QTableWidget, QTableWidgetItem, QHeaderView, QMessageBox)
+from PyQt6.QtCore import Qt, QThread, pyqtSignal, QDate
+from PyQt6.QtGui import QColor
+import pandas as pd
+from data.tracing import format_summary
+
+# (column in the screen result, header, scale, format)
+TABLE_COLUMNS = [
+    ('name', "Name", None, None),
+    ('total_return', "Return (%)", 1, "{:.2f}"),
+    ('excess_return', "Excess (%)", 1, "{:.2f}"),
+    ('sharpe', "Sharpe", 1, "{:.2f}"),
+    ('treynor', "Treynor", 1, "{:.2f}"),
+    ('beta', "Beta", 1, "{:.2f}"),
+    ('volatility', "Vol (%)", 100, "{:.2f}"),
+    ('max_drawdown', "MDD (%)", 1, "{:.2f}"),
+    ('tracking_error', "TE (%)", 100, "{:.2f}"),
+]
+
+class NumericItem(QTableWidgetItem):
+    """
+    Table item that shows formatted text but sorts by its numeric value.
+    """
+    def __init__(self, text, value):
+        super().__init__(text)
+        self.setData(Qt.ItemDataRole.UserRole, value)
+
+    def __lt__(self, other):
+        return self.data(Qt.ItemDataRole.UserRole) < other.data(Qt.ItemDataRole.UserRole)
+
+class ScreenerWorker(QThread):
+    finished = pyqtSignal(object, list) # result_df, stages
+    error = pyqtSignal(str)
+
+    def __init__(self, start_date, end_date):
+        super().__init__()
+        self.start_date = start_date
+        self.end_date = end_date
+
+    def run(self):
+        try:
+            from data.screener import ETFScreener
+            from data.tracing import trace
+            with trace("screener") as tr:
+                result = ETFScreener().screen(self.start_date, self.end_date)
+            self.finished.emit(result, tr.summary())
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            self.error.emit(str(e))
+
+class ScreenerWindow(QWidget):
+    def __init__(self):
+        super().__init__()
+        self.setWindowTitle("ETF 스크리너")
+        self.resize(1100, 800)
+
+        layout = QVBoxLayout(self)
+
+        # --- Input Section ---
+        input_layout = QHBoxLayout()
+
+        input_layout.addWidget(QLabel("Start:"))
+        self.start_date = QDateEdit()
+        self.start_date.setCalendarPopup(True)
+        self.start_date.setDate(QDate.currentDate().addYears(-1))
+        input_layout.addWidget(self.start_date)
+
+        input_layout.addWidget(QLabel("End:"))
+        self.end_date = QDateEdit()
+        self.end_date.setCalendarPopup(True)
+        self.end_date.setDate(QDate.currentDate())
+        input_layout.addWidget(self.end_date)
+
+        self.run_btn = QPushButton("스크리닝")
+        self.run_btn.clicked.connect(self.run_screen)
+        self.run_btn.setStyleSheet("background-color: #4CAF50; color: white; font-weight: bold; padding: 5px 15px;")
+        input_layout.addWidget(self.run_btn)
+        input_layout.addStretch()
+
+        layout.addLayout(input_layout)
+
+        # Summary Label
+        self.summary_label = QLabel("국내 주식형 ETF 전체의 성과 지표를 계산합니다.")
+        self.summary_label.setStyleSheet("font-size: 14px; font-weight: bold; margin: 10px 0;")
+        layout.addWidget(self.summary_label)
+
+        # Stage Timing Label
+        self.stages_label = QLabel("")
+        self.stages_label.setStyleSheet("font-size: 11px; color: #666;")
+        layout.addWidget(self.stages_label)
+
+        # Result Table (click a header to sort)
+        self.table = QTableWidget()
+        self.table.setColumnCount(len(TABLE_COLUMNS) + 1)
+        self.table.setHorizontalHeaderLabels(["Ticker"] + [header for _, header, _, _ in TABLE_COLUMNS])
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        layout.addWidget(self.table, stretch=1)
+
+    def run_screen(self):
+        start = self.start_date.date().toString("yyyyMMdd")
+        end = self.end_date.date().toString("yyyyMMdd")
+
+        self.run_btn.setEnabled(False)
+        self.run_btn.setText("계산 중...")
+        self.summary_label.setText("ETF 가격 스냅샷을 불러오는 중...")
+
+        self.worker = ScreenerWorker(start, end)
+        self.worker.finished.connect(self.on_finished)
+        self.worker.error.connect(self.on_error)
+        self.worker.start()
+
+    def on_finished(self, result, stages):
+        self.run_btn.setEnabled(True)
+        self.run_btn.setText("스크리닝")
+        self.summary_label.setText(f"{len(result)}개 ETF")
+        self.stages_label.setText(format_summary(stages))
+        self.update_table(result)
+
+    def on_error(self, msg):
+        self.run_btn.setEnabled(True)
+        self.run_btn.setText("스크리닝")
+        QMessageBox.critical(self, "Error", msg)
+        self.summary_label.setText("Error occurred.")
+
+    def update_table(self, df):
+        # Built-in sorting is disabled while filling, otherwise rows move under us
+        self.table.setSortingEnabled(False)
+        self.table.setRowCount(len(df))
+
+        for i, (ticker, row) in enumerate(df.iterrows()):
+            self.table.setItem(i, 0, QTableWidgetItem(str(ticker)))
+            for j, (col, _, scale, fmt) in enumerate(TABLE_COLUMNS, start=1):
+                value = row[col]
+                if fmt is None:
+                    item = QTableWidgetItem(str(value) if pd.notna(value) else "")
+                elif pd.isna(value):
+                    # Undefined values sort below every number
+                    item = NumericItem("N/A", float("-inf"))
+                else:
+                    value = float(value) * scale
+                    item = NumericItem(fmt.format(value), value)
+                    if col in ('total_return', 'excess_return'):
+                        if value > 0:
+                            item.setForeground(QColor("red"))
+                        elif value < 0:
+                            item.setForeground(QColor("blue"))
+                self.table.setItem(i, j, item)
+
+        self.table.setSortingEnabled(True)
@@ -1,6 +1,19 @@
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QLineEdit, QListWidget, 
                              QPushButton, QHBoxLayout, QLabel, QMessageBox, QCheckBox)
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QThread, pyqtSignal
+
+class ETFListLoader(QThread):
+    loaded = pyqtSignal(list)
+    
+    def run(self):
+        try:
+            from data.etf_data import ETFDataFetcher
+            fetcher = ETFDataFetcher()
+            # Always filtered now (served from the daily universe snapshot)
+            self.loaded.emit(fetcher.get_all_etf_list())
+        except Exception as e:
+            print(f"ETF list error: {e}")
+            self.loaded.emit([])
 
 class SearchDialog(QDialog):
     def __init__(self, parent=None):
@@ -37,14 +50,19 @@ class SearchDialog(QDialog):
         self.load_data()
         
     def load_data(self):
-        try:
-            from data.etf_data import ETFDataFetcher
-            fetcher = ETFDataFetcher()
-            # Always filtered now
-            self.all_items = fetcher.get_all_etf_list()
-            self.update_list(self.all_items)
-        except Exception as e:
-            QMessageBox.warning(self, "Error", f"Failed to load ETF list: {e}")
+        # Load off the GUI thread; the first build of the day may take a moment
+        self.search_input.setPlaceholderText("Loading ETF list...")
+        self.loader = ETFListLoader()
+        self.loader.loaded.connect(self.on_data_loaded)
+        self.loader.start()
+        
+    def on_data_loaded(self, items):
+        self.search_input.setPlaceholderText("Search by name or ticker...")
+        if not items:
+            QMessageBox.warning(self, "Error", "Failed to load ETF list.")
+            return
+        self.all_items = items
+        self.filter_list(self.search_input.text())
 
     def update_list(self, items):
         self.list_widget.clear()
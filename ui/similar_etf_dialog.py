@@ -0,0 +1,76 @@
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QLabel, QTableWidget, QTableWidgetItem,
+                             QHeaderView, QPushButton, QHBoxLayout)
+from PyQt6.QtCore import QThread, pyqtSignal
+
+class SimilarETFWorker(QThread):
+    finished = pyqtSignal(object, str) # similar_df, date
+    error = pyqtSignal(str)
+
+    def __init__(self, ticker, k=10):
+        super().__init__()
+        self.ticker = ticker
+        self.k = k
+
+    def run(self):
+        try:
+            from data.holdings_matrix import get_holdings_matrix
+            # Shared with the startup build: waits for it instead of starting another one.
+            # An ETF without a row gets its own PDF fetched and added.
+            matrix = get_holdings_matrix(ticker=self.ticker)
+            if self.ticker not in matrix:
+                self.error.emit(f"{self.ticker}의 PDF 정보가 없습니다.")
+                return
+            similar = matrix.similar(self.ticker, self.k)
+            similar['name'] = [matrix.names.get(t, "") for t in similar.index]
+            self.finished.emit(similar, matrix.date)
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            self.error.emit(str(e))
+
+class SimilarETFDialog(QDialog):
+    """
+    Lists the ETFs whose baskets are most similar to the given ETF.
+    """
+    def __init__(self, ticker, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(f"유사 ETF - {ticker}")
+        self.resize(600, 420)
+
+        layout = QVBoxLayout(self)
+
+        self.info_label = QLabel("전체 ETF 구성 종목을 불러오는 중... (하루 한 번, 처음에는 시간이 걸립니다)")
+        layout.addWidget(self.info_label)
+
+        self.table = QTableWidget()
+        self.table.setColumnCount(4)
+        self.table.setHorizontalHeaderLabels(["Ticker", "Name", "Cosine", "Overlap (%)"])
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        layout.addWidget(self.table)
+
+        btn_layout = QHBoxLayout()
+        btn_layout.addStretch()
+        close_btn = QPushButton("닫기")
+        close_btn.clicked.connect(self.accept)
+        btn_layout.addWidget(close_btn)
+        layout.addLayout(btn_layout)
+
+        # The query itself takes milliseconds; the worker only matters while
+        # the holdings matrix is not built yet
+        self.worker = SimilarETFWorker(ticker)
+        self.worker.finished.connect(self.on_finished)
+        self.worker.error.connect(self.on_error)
+        self.worker.start()
+
+    def on_finished(self, similar, date):
+        self.info_label.setText(f"{date} PDF 기준, 코사인 유사도 순 (Overlap: 공통 종목의 작은 비중 합)")
+        self.table.setRowCount(len(similar))
+        for i, (ticker, row) in enumerate(similar.iterrows()):
+            self.table.setItem(i, 0, QTableWidgetItem(str(ticker)))
+            self.table.setItem(i, 1, QTableWidgetItem(row['name']))
+            self.table.setItem(i, 2, QTableWidgetItem(f"{row['cosine']:.3f}"))
+            self.table.setItem(i, 3, QTableWidgetItem(f"{row['overlap']:.2f}"))
+
+    def on_error(self, msg):
+        self.info_label.setText(f"Error: {msg}")